@@ -0,0 +1,236 @@
+#include "analysisdataloader.h"
+#include <QByteArray>
+#include <QJsonDocument>
+
+AnalysisDataLoader::AnalysisDataLoader(QObject *parent)
+    : QObject(parent)
+    , data(nullptr)
+    , size(0)
+    , lastProgress(-1)
+{
+}
+
+AnalysisDataLoader::~AnalysisDataLoader()
+{
+    reset();
+}
+
+void AnalysisDataLoader::reset()
+{
+    if (file.isOpen()) {
+        file.close();   // Also unmaps the file
+    }
+    data = nullptr;
+    size = 0;
+    lastProgress = -1;
+    metadata = QJsonObject();
+}
+
+void AnalysisDataLoader::load(const QString &filePath)
+{
+    reset();
+    emit progressChanged(0);
+
+    file.setFileName(filePath);
+    if (!file.open(QIODevice::ReadOnly)) {
+        emit loadFailed(filePath);
+        emit finished();
+        return;
+    }
+
+    // Map the file instead of reading it, so only the pages we touch are paged in
+    size = file.size();
+    data = size > 0 ? reinterpret_cast<const char *>(file.map(0, size)) : nullptr;
+
+    if (data == nullptr || !indexDocument()) {
+        reset();
+        emit loadFailed(filePath);
+        emit finished();
+        return;
+    }
+
+    // The decoded metadata owns its data, so the mapping can go before it is handed out
+    QJsonObject loadedMetadata = metadata;
+    reset();
+
+    emit progressChanged(100);
+    emit metadataLoaded(loadedMetadata, filePath);
+    emit finished();
+}
+
+bool AnalysisDataLoader::indexDocument()
+{
+    qint64 pos = 0;
+    if (size >= 3 && qstrncmp(data, "\xEF\xBB\xBF", 3) == 0) {
+        pos = 3;   // UTF-8 BOM
+    }
+
+    pos = skipWhitespace(pos);
+    if (pos >= size || data[pos] != '{') {
+        return false;
+    }
+    pos++;
+
+    bool hasMetadata = false;
+    while (true) {
+        pos = skipWhitespace(pos);
+        if (pos >= size) {
+            return false;
+        }
+        if (data[pos] == '}') {
+            break;
+        }
+        if (data[pos] != '"') {
+            return false;
+        }
+
+        qint64 keyEnd = skipString(pos);
+        if (keyEnd < 0) {
+            return false;
+        }
+        QString key = QString::fromUtf8(data + pos + 1, keyEnd - pos - 2);
+
+        pos = skipWhitespace(keyEnd);
+        if (pos >= size || data[pos] != ':') {
+            return false;
+        }
+        pos = skipWhitespace(pos + 1);
+        if (pos >= size) {
+            return false;
+        }
+
+        qint64 valueEnd;
+        if (key == "frames" && data[pos] == '[') {
+            valueEnd = skipFrames(pos);
+        } else {
+            valueEnd = skipValue(pos);
+            if (key == "metadata" && valueEnd > pos) {
+                // Only the small metadata object is decoded eagerly
+                QJsonDocument doc = QJsonDocument::fromJson(QByteArray::fromRawData(data + pos, valueEnd - pos));
+                if (!doc.isObject()) {
+                    return false;
+                }
+                metadata = doc.object();
+                hasMetadata = true;
+            }
+        }
+        if (valueEnd < 0) {
+            return false;
+        }
+
+        reportProgress(valueEnd);
+        pos = skipWhitespace(valueEnd);
+        if (pos < size && data[pos] == ',') {
+            pos++;
+        } else if (pos < size && data[pos] == '}') {
+            break;
+        } else {
+            return false;
+        }
+    }
+
+    return hasMetadata;
+}
+
+qint64 AnalysisDataLoader::skipWhitespace(qint64 pos) const
+{
+    while (pos < size && (data[pos] == ' ' || data[pos] == '\n' || data[pos] == '\r' || data[pos] == '\t')) {
+        pos++;
+    }
+    return pos;
+}
+
+qint64 AnalysisDataLoader::skipString(qint64 pos) const
+{
+    // pos is on the opening quote; returns the position after the closing quote
+    pos++;
+    while (pos < size) {
+        if (data[pos] == '\\') {
+            pos += 2;
+        } else if (data[pos] == '"') {
+            return pos + 1;
+        } else {
+            pos++;
+        }
+    }
+    return -1;
+}
+
+qint64 AnalysisDataLoader::skipValue(qint64 pos) const
+{
+    char first = data[pos];
+    if (first == '"') {
+        return skipString(pos);
+    }
+
+    if (first == '{' || first == '[') {
+        int depth = 0;
+        while (pos < size) {
+            char c = data[pos];
+            if (c == '"') {
+                pos = skipString(pos);
+                if (pos < 0) {
+                    return -1;
+                }
+                continue;
+            }
+            if (c == '{' || c == '[') {
+                depth++;
+            } else if (c == '}' || c == ']') {
+                depth--;
+                if (depth == 0) {
+                    return pos + 1;
+                }
+            }
+            pos++;
+        }
+        return -1;
+    }
+
+    // Number, true, false or null
+    while (pos < size && data[pos] != ',' && data[pos] != '}' && data[pos] != ']'
+           && data[pos] != ' ' && data[pos] != '\n' && data[pos] != '\r' && data[pos] != '\t') {
+        pos++;
+    }
+    return pos;
+}
+
+qint64 AnalysisDataLoader::skipFrames(qint64 pos)
+{
+    // pos is on the opening bracket of the "frames" array; frames are skipped
+    // one by one so a large array still reports steady progress
+    pos++;
+    while (true) {
+        pos = skipWhitespace(pos);
+        if (pos >= size) {
+            return -1;
+        }
+        if (data[pos] == ']') {
+            return pos + 1;
+        }
+
+        qint64 end = skipValue(pos);
+        if (end < 0) {
+            return -1;
+        }
+        reportProgress(end);
+
+        pos = skipWhitespace(end);
+        if (pos < size && data[pos] == ',') {
+            pos++;
+        } else if (pos < size && data[pos] == ']') {
+            return pos + 1;
+        } else {
+            return -1;
+        }
+    }
+}
+
+void AnalysisDataLoader::reportProgress(qint64 pos)
+{
+    int percent = static_cast<int>(pos * 100 / size);
+    if (percent != lastProgress) {
+        lastProgress = percent;
+        emit progressChanged(percent);
+    }
+}
@@ -0,0 +1,45 @@
+#ifndef ANALYSISDATALOADER_H
+#define ANALYSISDATALOADER_H
+
+#include <QObject>
+#include <QFile>
+#include <QString>
+#include <QJsonObject>
+
+// Loads analysis JSON exports on a worker thread. Only the top-level
+// "metadata" object is decoded; every other value, including a large "frames"
+// array, is skipped in place while progress is reported.
+class AnalysisDataLoader : public QObject
+{
+    Q_OBJECT
+
+public:
+    explicit AnalysisDataLoader(QObject *parent = nullptr);
+    ~AnalysisDataLoader();
+
+public slots:
+    void load(const QString &filePath);
+
+signals:
+    void progressChanged(int percent);
+    void metadataLoaded(const QJsonObject &metadata, const QString &filePath);
+    void loadFailed(const QString &filePath);
+    void finished();
+
+private:
+    void reset();
+    bool indexDocument();
+    qint64 skipWhitespace(qint64 pos) const;
+    qint64 skipString(qint64 pos) const;
+    qint64 skipValue(qint64 pos) const;
+    qint64 skipFrames(qint64 pos);
+    void reportProgress(qint64 pos);
+
+    QFile file;
+    const char *data;
+    qint64 size;
+    int lastProgress;
+    QJsonObject metadata;
+};
+
+#endif // ANALYSISDATALOADER_H
@@ -1,10 +1,16 @@
 #include "mainwindow.h"
 #include "ui_mainwindow.h"
+#include "analysisdataloader.h"
 #include <QMessageBox>
 #include <QFileDialog>
 #include <QJsonDocument>
 #include <QJsonObject>
 #include <QJsonValue>
+#include <QUdpSocket>
+#include <QNetworkDatagram>
+
+// Must match LiveStatsPublisher's default port in football_analysis-main/live_stats
+static const quint16 LIVE_STATS_PORT = 45454;
 
 MainWindow::MainWindow(QWidget *parent)
     : QMainWindow(parent)
@@ -14,6 +20,8 @@ MainWindow::MainWindow(QWidget *parent)
     , currentDistance(8)
     , practiceInProgress(false)
     , hasVideoAnalysisData(false)
+    , videoAnalysisLoader(new AnalysisDataLoader)
+    , liveStatsSocket(new QUdpSocket(this))
 {
     ui->setupUi(this);
     
@@ -30,6 +38,21 @@ MainWindow::MainWindow(QWidget *parent)
     // Connect video analysis button
     connect(ui->pushButtonLoadVideoAnalysis, &QPushButton::clicked, this, &MainWindow::onLoadVideoAnalysisClicked);
     
+    // Load analysis files on a worker thread so large exports do not freeze the window
+    videoAnalysisLoader->moveToThread(&videoAnalysisThread);
+    connect(&videoAnalysisThread, &QThread::finished, videoAnalysisLoader, &QObject::deleteLater);
+    connect(this, &MainWindow::videoAnalysisLoadRequested, videoAnalysisLoader, &AnalysisDataLoader::load);
+    connect(videoAnalysisLoader, &AnalysisDataLoader::progressChanged, this, &MainWindow::onVideoAnalysisLoadProgress);
+    connect(videoAnalysisLoader, &AnalysisDataLoader::metadataLoaded, this, &MainWindow::onVideoAnalysisMetadataLoaded);
+    connect(videoAnalysisLoader, &AnalysisDataLoader::loadFailed, this, &MainWindow::onVideoAnalysisLoadFailed);
+    connect(videoAnalysisLoader, &AnalysisDataLoader::finished, this, &MainWindow::onVideoAnalysisLoadFinished);
+    videoAnalysisThread.start();
+    
+    // Subscribe to rolling stats published by a running analysis on this machine
+    if (liveStatsSocket->bind(QHostAddress::LocalHost, LIVE_STATS_PORT)) {
+        connect(liveStatsSocket, &QUdpSocket::readyRead, this, &MainWindow::onLiveStatsReadyRead);
+    }
+    
     // Set table properties
     ui->tableWidgetPlayers->setEditTriggers(QAbstractItemView::NoEditTriggers);
     ui->tableWidgetPlayers->horizontalHeader()->setStretchLastSection(true);
@@ -40,6 +63,8 @@ MainWindow::MainWindow(QWidget *parent)
 
 MainWindow::~MainWindow()
 {
+    videoAnalysisThread.quit();
+    videoAnalysisThread.wait();
     delete ui;
 }
 
@@ -275,7 +300,19 @@ void MainWindow::onLoadVideoAnalysisClicked()
         return;
     }
     
-    if (loadVideoAnalysisData(fileName)) {
+    // Loading continues on the worker thread; results arrive through the slots below
+    ui->pushButtonLoadVideoAnalysis->setEnabled(false);
+    emit videoAnalysisLoadRequested(fileName);
+}
+
+void MainWindow::onVideoAnalysisLoadProgress(int percent)
+{
+    ui->statusbar->showMessage(QString("正在載入視頻分析數據... %1%").arg(percent));
+}
+
+void MainWindow::onVideoAnalysisMetadataLoaded(const QJsonObject &metadata, const QString &filePath)
+{
+    if (applyVideoAnalysisMetadata(metadata, filePath)) {
         displayVideoAnalysisData();
         QMessageBox::information(this, "成功", "視頻分析數據已載入！");
     } else {
@@ -283,28 +320,71 @@ void MainWindow::onLoadVideoAnalysisClicked()
     }
 }
 
-bool MainWindow::loadVideoAnalysisData(const QString &filePath)
+void MainWindow::onVideoAnalysisLoadFailed(const QString &filePath)
+{
+    Q_UNUSED(filePath);
+    QMessageBox::warning(this, "錯誤", "無法載入視頻分析數據文件！");
+}
+
+void MainWindow::onVideoAnalysisLoadFinished()
+{
+    ui->statusbar->clearMessage();
+    ui->pushButtonLoadVideoAnalysis->setEnabled(true);
+}
+
+void MainWindow::onLiveStatsReadyRead()
 {
-    QFile file(filePath);
-    if (!file.open(QIODevice::ReadOnly | QIODevice::Text)) {
-        return false;
+    // Only the newest snapshot matters, so drain the queue and keep the last datagram
+    QByteArray latest;
+    while (liveStatsSocket->hasPendingDatagrams()) {
+        latest = liveStatsSocket->receiveDatagram().data();
     }
     
-    QByteArray jsonData = file.readAll();
-    file.close();
+    // A loaded analysis file stays on screen; live data only fills the view when no file is shown
+    if (hasVideoAnalysisData && !videoAnalysisData.dataFilePath.isEmpty()) {
+        return;
+    }
     
-    QJsonDocument doc = QJsonDocument::fromJson(jsonData);
-    if (doc.isNull() || !doc.isObject()) {
-        return false;
+    QJsonDocument doc = QJsonDocument::fromJson(latest);
+    if (!doc.isObject() || doc.object().value("type").toString() != "live_stats") {
+        return;
     }
     
     QJsonObject root = doc.object();
-    if (!root.contains("metadata")) {
-        return false;
+    QJsonObject metadata = root.value("metadata").toObject();
+    if (!applyVideoAnalysisMetadata(metadata, QString())) {
+        return;
+    }
+    displayVideoAnalysisData();
+    
+    // Show the player who has covered the most distance so far
+    QJsonObject players = root.value("players").toObject();
+    QString leader;
+    double leaderDistance = -1.0;
+    for (auto it = players.constBegin(); it != players.constEnd(); ++it) {
+        double distance = it.value().toObject().value("distance").toDouble(0.0);
+        if (distance > leaderDistance) {
+            leaderDistance = distance;
+            leader = it.key();
+        }
     }
     
-    QJsonObject metadata = root["metadata"].toObject();
-    
+    QString status = QString("即時數據 (%1): 第 %2 / %3 幀")
+        .arg(metadata.value("stage").toString())
+        .arg(metadata.value("current_frame").toInt(0) + 1)
+        .arg(videoAnalysisData.totalFrames);
+    if (!leader.isEmpty()) {
+        QJsonObject leaderStats = players.value(leader).toObject();
+        status += QString(" | 球員 %1: %2 km/h, %3 m")
+            .arg(leader)
+            .arg(leaderStats.value("speed").toDouble(0.0), 0, 'f', 2)
+            .arg(leaderDistance, 0, 'f', 2);
+    }
+    ui->statusbar->showMessage(status);
+}
+
+bool MainWindow::applyVideoAnalysisMetadata(const QJsonObject &metadata, const QString &filePath)
+{
     // Validate that all required fields exist
     QStringList requiredFields = {
         "total_frames", "team_1_ball_control_percent", "team_2_ball_control_percent",
@@ -5,6 +5,11 @@
 #include <QString>
 #include <QVector>
 #include <QElapsedTimer>
+#include <QThread>
+#include <QJsonObject>
+
+class AnalysisDataLoader;
+class QUdpSocket;
 
 QT_BEGIN_NAMESPACE
 namespace Ui {
@@ -56,6 +61,14 @@ private slots:
     void onEndPracticeClicked();
     void onShowStatsClicked();
     void onLoadVideoAnalysisClicked();
+    void onVideoAnalysisLoadProgress(int percent);
+    void onVideoAnalysisMetadataLoaded(const QJsonObject &metadata, const QString &filePath);
+    void onVideoAnalysisLoadFailed(const QString &filePath);
+    void onVideoAnalysisLoadFinished();
+    void onLiveStatsReadyRead();
+
+signals:
+    void videoAnalysisLoadRequested(const QString &filePath);
 
 private:
     void updatePracticeDisplay();
@@ -63,7 +76,7 @@ private:
     void checkAndAutoEndPractice();
     double calculateSuccessRate(int successful, int total) const;
     double convertToSeconds(qint64 milliseconds) const;
-    bool loadVideoAnalysisData(const QString &filePath);
+    bool applyVideoAnalysisMetadata(const QJsonObject &metadata, const QString &filePath);
     void displayVideoAnalysisData();
     
     Ui::MainWindow *ui;
@@ -76,5 +89,8 @@ private:
     QString currentPlayerName;
     VideoAnalysisData videoAnalysisData;
     bool hasVideoAnalysisData;
+    QThread videoAnalysisThread;
+    AnalysisDataLoader *videoAnalysisLoader;
+    QUdpSocket *liveStatsSocket;
 };
 #endif // MAINWINDOW_H
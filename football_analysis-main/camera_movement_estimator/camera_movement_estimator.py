@@ -1,10 +1,8 @@
-import pickle
 import cv2
 import numpy as np
-import os
 import sys 
 sys.path.append('../')
-from utils import measure_distance, measure_xy_distance
+from utils import measure_distance, measure_xy_distance, read_stub, save_stub
 
 
 class CameraMovementEstimator():
@@ -17,7 +15,7 @@ class CameraMovementEstimator():
             criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
         )
 
-        first_frame_grayscale = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        first_frame_grayscale = self.to_grayscale(frame)
 
         mask_features = np.zeros_like(first_frame_grayscale)
         mask_features[:, 0:20] = 1
@@ -31,6 +29,14 @@ class CameraMovementEstimator():
             mask=mask_features
         )
 
+        self.reset_camera_movement()
+
+    def to_grayscale(self, frame):
+        # Frames from a grayscale FrameCache are already single channel
+        if frame.ndim == 2:
+            return frame
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
     def add_adjust_positions_to_tracks(self, tracks, camera_movement_per_frame):
         for object_name, object_tracks in tracks.items():
             for frame_num, track in enumerate(object_tracks):
@@ -45,55 +51,66 @@ class CameraMovementEstimator():
 
                     tracks[object_name][frame_num][track_id]['position_adjusted'] = position_adjusted
 
-    def get_camera_movement(self, frames, read_from_stub=False, stub_path=None):
-        if read_from_stub and stub_path is not None and os.path.exists(stub_path):
-            with open(stub_path, 'rb') as f:
-                return pickle.load(f)
-
-        camera_movement = [[0, 0] for _ in range(len(frames))]
-
-        old_gray = cv2.cvtColor(frames[0], cv2.COLOR_BGR2GRAY)
-        old_features = cv2.goodFeaturesToTrack(old_gray, **self.features)
+    def reset_camera_movement(self):
+        self.camera_movement = []
+        self.old_gray = None
+        self.old_features = None
+
+    def update_camera_movement(self, frame):
+        # Optical flow only needs the previous frame, so frames can be fed one at a time as they are decoded
+        frame_gray = self.to_grayscale(frame)
+        if self.old_gray is None:
+            self.camera_movement.append([0, 0])
+            self.old_gray = frame_gray
+            self.old_features = cv2.goodFeaturesToTrack(frame_gray, **self.features)
+            return self.camera_movement[-1]
+
+        new_features, _, _ = cv2.calcOpticalFlowPyrLK(
+            self.old_gray,
+            frame_gray,
+            self.old_features,
+            None,
+            **self.lk_params
+        )
 
-        for frame_num in range(1, len(frames)):
-            frame_gray = cv2.cvtColor(frames[frame_num], cv2.COLOR_BGR2GRAY)
+        max_distance = 0
+        camera_movement_x, camera_movement_y = 0, 0
 
-            new_features, _, _ = cv2.calcOpticalFlowPyrLK(
-                old_gray,
-                frame_gray,
-                old_features,
-                None,
-                **self.lk_params
-            )
+        for new, old in zip(new_features, self.old_features):
+            new_pt = new.ravel()
+            old_pt = old.ravel()
 
-            max_distance = 0
-            camera_movement_x, camera_movement_y = 0, 0
+            distance = measure_distance(new_pt, old_pt)
+            if distance > max_distance:
+                max_distance = distance
+                camera_movement_x, camera_movement_y = measure_xy_distance(old_pt, new_pt)
 
-            for new, old in zip(new_features, old_features):
-                new_pt = new.ravel()
-                old_pt = old.ravel()
+        if max_distance > self.minimum_distance:
+            self.camera_movement.append([camera_movement_x, camera_movement_y])
+            self.old_features = cv2.goodFeaturesToTrack(frame_gray, **self.features)
+        else:
+            self.camera_movement.append([0, 0])
 
-                distance = measure_distance(new_pt, old_pt)
-                if distance > max_distance:
-                    max_distance = distance
-                    camera_movement_x, camera_movement_y = measure_xy_distance(old_pt, new_pt)
+        self.old_gray = frame_gray
+        return self.camera_movement[-1]
 
-            if max_distance > self.minimum_distance:
-                camera_movement[frame_num] = [camera_movement_x, camera_movement_y]
-                old_features = cv2.goodFeaturesToTrack(frame_gray, **self.features)
+    def get_camera_movement(self, frames, read_from_stub=False, stub_path=None):
+        camera_movement = read_stub(read_from_stub, stub_path)
+        if camera_movement is not None:
+            return camera_movement
 
-            old_gray = frame_gray
+        self.reset_camera_movement()
+        for frame in frames:
+            self.update_camera_movement(frame)
 
-        if stub_path is not None:
-            with open(stub_path, 'wb') as f:
-                pickle.dump(camera_movement, f)
+        save_stub(stub_path, self.camera_movement)
 
-        return camera_movement
+        return self.camera_movement
 
-    def draw_camera_movement(self, frames, camera_movement_per_frame):
+    def draw_camera_movement(self, frames, camera_movement_per_frame, frame_offset=0):
         output_frames = []
 
-        for frame_num, frame in enumerate(frames):
+        for frame_num, frame in enumerate(frames, frame_offset):
             # 直接畫在 frame 上，不 copy、不 overlay
             cv2.rectangle(frame, (0, 0), (500, 100), (255, 255, 255), -1)
 
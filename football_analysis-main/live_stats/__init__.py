@@ -0,0 +1 @@
+from .live_stats import LiveStatsPublisher
\ No newline at end of file
@@ -0,0 +1,111 @@
+import json
+import socket
+import time
+import numpy as np
+
+
+class LiveStatsPublisher():
+    def __init__(self, total_frames, half_field, host='127.0.0.1', port=45454, rate_hz=5, player_timeout_frames=48):
+        # Fire-and-forget UDP datagrams: publishing never blocks, and nobody has to be listening
+        self.address = (host, port)
+        self.min_interval = 1.0 / rate_hz
+        self.last_publish_time = None
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+        # half_field comes from PossessionEventEngine so live and final attack counts agree;
+        # total_frames may be None until tracking has seen the whole video
+        self.total_frames = total_frames
+        self.half_field = half_field
+
+        # Running possession counts, updated once per frame by the ball assignment loop
+        self.possession_frames = 0
+        self.team_frames = {1: 0, 2: 0}
+        self.attack_frames = {1: 0, 2: 0}
+        self.current_team = 0
+        self.current_ball_x = None
+
+        # Last known team, speed and distance per player. Speed is only written for some frames
+        # (never the last one), so a player keeps its last value until it is gone for player_timeout_frames
+        self.player_timeout_frames = player_timeout_frames
+        self.players = {}
+        self.players_stage = None
+
+    def update_possession(self, assigned_team, ball_pitch_x=None):
+        # Same forward fill as PossessionEventEngine.process, one frame at a time
+        self.possession_frames += 1
+        if assigned_team > 0:
+            self.current_team = int(assigned_team)
+        if ball_pitch_x is not None and not np.isnan(ball_pitch_x):
+            self.current_ball_x = float(ball_pitch_x)
+
+        if self.current_team == 0:
+            return
+        self.team_frames[self.current_team] += 1
+        if self.current_ball_x is None:
+            return
+        if ((self.current_team == 1 and self.current_ball_x > self.half_field) or
+                (self.current_team == 2 and self.current_ball_x < self.half_field)):
+            self.attack_frames[self.current_team] += 1
+
+    def update_players(self, frame_num, player_track, stage):
+        # Each pass walks the video from the start again, so values from an earlier pass are dropped
+        if stage != self.players_stage:
+            self.players_stage = stage
+            self.players = {}
+
+        for player_id, player in player_track.items():
+            stats = self.players.setdefault(player_id, {"team": 0, "speed": None, "distance": None})
+            stats["last_frame"] = frame_num
+            if 'team' in player:
+                stats["team"] = int(player['team'])
+            if player.get('speed') is not None and player.get('distance') is not None:
+                stats["speed"] = float(player['speed'])
+                stats["distance"] = float(player['distance'])
+
+    def get_stats(self, frame_num, stage):
+        controlled_frames = max(self.team_frames[1] + self.team_frames[2], 1)
+
+        metadata = {"total_frames": self.total_frames, "current_frame": frame_num, "stage": stage}
+        for team in (1, 2):
+            metadata[f"team_{team}_ball_control_percent"] = round(self.team_frames[team] / controlled_frames * 100, 2)
+            metadata[f"team_{team}_frames"] = self.team_frames[team]
+            metadata[f"team_{team}_attack_percent"] = round(self.attack_frames[team] / max(self.possession_frames, 1) * 100, 2)
+            metadata[f"team_{team}_attack_frames"] = self.attack_frames[team]
+
+        # Players that left the picture long ago are forgotten, which also keeps this dict small
+        self.players = {player_id: stats for player_id, stats in self.players.items()
+                        if frame_num - stats["last_frame"] <= self.player_timeout_frames}
+
+        players = {}
+        for player_id, stats in self.players.items():
+            if stats["speed"] is None:
+                continue
+            players[str(player_id)] = {
+                "team": stats["team"],
+                "speed": round(stats["speed"], 2),
+                "distance": round(stats["distance"], 2),
+            }
+
+        return {"type": "live_stats", "metadata": metadata, "players": players}
+
+    def publish(self, frame_num, stage, player_track=None, force=False):
+        # player_track is recorded on every call, even when the rate limit skips sending
+        if player_track is not None:
+            self.update_players(frame_num, player_track, stage)
+
+        now = time.monotonic()
+        if not force and self.last_publish_time is not None and now - self.last_publish_time < self.min_interval:
+            return False
+        self.last_publish_time = now
+
+        message = json.dumps(self.get_stats(frame_num, stage)).encode('utf-8')
+        try:
+            self.socket.sendto(message, self.address)
+        except OSError:
+            # A full socket buffer or missing listener must never stall the analysis
+            return False
+        return True
+
+    def close(self):
+        self.socket.close()
@@ -1,4 +1,5 @@
-from utils import read_video, save_video
+from utils import (read_video, read_video_frames_generator, read_video_chunks, open_video_writer,
+                   read_stub, save_stub, FramePool, FrameCache, MemoryPlanner)
 from trackers import Tracker
 import cv2
 import numpy as np
@@ -7,26 +8,145 @@ from player_ball_assigner import PlayerBallAssigner
 from camera_movement_estimator import CameraMovementEstimator
 from view_transformer import ViewTransformer
 from speed_and_distance_estimator import SpeedAndDistance_Estimator
+from pitch_analytics import PitchAnalytics
+from possession_events import PossessionEventEngine
+from live_stats import LiveStatsPublisher
+from track_index import TrackIndex
 
+TRACK_STUB_PATH = 'stubs/track_stubs.pkl'
+CAMERA_MOVEMENT_STUB_PATH = 'stubs/camera_movement_stub.pkl'
 
-def main():
-    # Read Video
-    video_frames = read_video('input_videos/08fd33_4.mp4')
+
+def assign_player_teams(team_assigner, frames, tracks, live_stats_publisher, frame_offset=0):
+    for frame_num, frame in enumerate(frames, frame_offset):
+        player_track = tracks['players'][frame_num]
+        for player_id, track in player_track.items():
+            team = team_assigner.get_player_team(frame,
+                                                 track['bbox'],
+                                                 player_id,
+                                                 frame_num)
+            track['team'] = team
+            track['team_color'] = team_assigner.team_colors[team]
+        live_stats_publisher.publish(frame_num, 'team_assignment', player_track)
+
+
+def copy_chunks(video_frames, chunk_size, frame_pool):
+    # Copy cached frames into pooled buffers, so annotating never dirties the cache pages
+    for frame_offset in range(0, len(video_frames), chunk_size):
+        chunk_frames = []
+        for frame in video_frames[frame_offset:frame_offset+chunk_size]:
+            buffer = frame_pool.acquire()
+            np.copyto(buffer, frame)
+            chunk_frames.append(buffer)
+        yield frame_offset, chunk_frames
+
+
+def main(use_frame_cache=False, memory_budget_gb=8):
+    video_path = 'input_videos/08fd33_4.mp4'
+    frame_cache = FrameCache('stubs/frame_cache')
+
+    # Pick the fastest execution mode and batch/chunk sizes that fit the memory budget and free disk space
+    memory_plan = MemoryPlanner(memory_budget_gb * 1024**3).plan(video_path, frame_cache=frame_cache)
+    print(f"Memory plan: {memory_plan['mode']}, detection batch {memory_plan['detection_batch_size']}, "
+          f"render chunk {memory_plan['render_chunk_size']}, "
+          f"estimated peak {memory_plan['estimated_peak_bytes'] / 1024**3:.2f} GiB")
+
+    streaming = memory_plan['mode'] == 'streaming'
+    chunk_size = memory_plan['render_chunk_size']
+
+    if streaming:
+        # No frame list at all: each pass below decodes the video again, one chunk of pooled buffers at a time
+        video_frames = None
+        first_frames = read_video_frames_generator(video_path)
+        _, first_frame = next(first_frames)
+        first_frames.close()
+        frame_pool = FramePool(first_frame.shape, chunk_size)
+    else:
+        if use_frame_cache or memory_plan['mode'] == 'chunked':
+            # Decode once into a memory-mapped cache and reuse it on every later run
+            video_frames = read_video(video_path, frame_cache=frame_cache)
+        else:
+            # Read Video; every frame stays resident until it is annotated in place below
+            video_frames = read_video(video_path)
+        first_frame = video_frames[0]
 
     # Initialize Tracker
-    tracker = Tracker('models/best.pt')
+    tracker = Tracker('models/best.pt', batch_size=memory_plan['detection_batch_size'])
+
+    # camera movement estimator
+    camera_movement_estimator = CameraMovementEstimator(first_frame)
+
+    # Publish running stats to the Qt viewer from tracking, the per-frame analysis loops and rendering
+    possession_event_engine = PossessionEventEngine()
+    live_stats_publisher = LiveStatsPublisher(memory_plan['frame_count'] if streaming else len(video_frames),
+                                              possession_event_engine.half_field)
+    publish_tracking_progress = lambda frame_num: live_stats_publisher.publish(frame_num, 'tracking')
+
+    ball_crop_frame_nums, ball_crop_centers = np.empty(0, dtype=np.int64), np.empty((0, 2))
+    tracks_computed = False
+    if streaming:
+        # Pass 1: tracking and camera movement; ByteTrack and optical flow state carry over between chunks
+        tracks = read_stub(True, TRACK_STUB_PATH)
+        camera_movement_per_frame = read_stub(True, CAMERA_MOVEMENT_STUB_PATH)
+        if tracks is None or camera_movement_per_frame is None:
+            tracker.reset_tracking()
+            camera_movement_estimator.reset_camera_movement()
+            for frame_offset, chunk_frames in read_video_chunks(video_path, chunk_size, frame_pool):
+                if tracks is None:
+                    tracker.track_frames(chunk_frames, frame_offset, progress_callback=publish_tracking_progress)
+                else:
+                    live_stats_publisher.publish(frame_offset + len(chunk_frames) - 1, 'camera_movement')
+                if camera_movement_per_frame is None:
+                    for frame in chunk_frames:
+                        camera_movement_estimator.update_camera_movement(frame)
+                frame_pool.release_all(chunk_frames)
+
+            if tracks is None:
+                tracks = tracker.get_tracks()
+                tracks_computed = True
+                ball_crop_frame_nums, ball_crop_centers = tracker.get_ball_crop_candidates()
+            if camera_movement_per_frame is None:
+                camera_movement_per_frame = camera_movement_estimator.camera_movement
+                save_stub(CAMERA_MOVEMENT_STUB_PATH, camera_movement_per_frame)
+    else:
+        tracks = tracker.get_object_tracks(video_frames,
+                                           read_from_stub=True,
+                                           stub_path=TRACK_STUB_PATH,
+                                           progress_callback=publish_tracking_progress)
+        camera_movement_per_frame = camera_movement_estimator.get_camera_movement(video_frames,
+                                                                                    read_from_stub=True,
+                                                                                    stub_path=CAMERA_MOVEMENT_STUB_PATH)
+
+    live_stats_publisher.total_frames = len(tracks['players'])
+
+    # Assign Player Teams
+    team_assigner = TeamAssigner()
+    team_assigner.assign_team_color(first_frame,
+                                    tracks['players'][0])
 
-    tracks = tracker.get_object_tracks(video_frames,
-                                       read_from_stub=True,
-                                       stub_path='stubs/track_stubs.pkl')
-    # Get object positions 
+    if streaming:
+        # Pass 2: ball crop detections where the full-frame pass missed the ball, and team assignment
+        for frame_offset, chunk_frames in read_video_chunks(video_path, chunk_size, frame_pool):
+            first, last = np.searchsorted(ball_crop_frame_nums, (frame_offset, frame_offset + len(chunk_frames)))
+            if last > first:
+                tracker.add_ball_crop_detections(tracks, chunk_frames,
+                                                 ball_crop_frame_nums[first:last], ball_crop_centers[first:last],
+                                                 frame_offset=frame_offset)
+            assign_player_teams(team_assigner, chunk_frames, tracks, live_stats_publisher, frame_offset)
+            frame_pool.release_all(chunk_frames)
+
+        # Like get_object_tracks, save freshly computed tracks whether or not any crop detections were added
+        if tracks_computed:
+            save_stub(TRACK_STUB_PATH, tracks)
+    else:
+        assign_player_teams(team_assigner, video_frames, tracks, live_stats_publisher)
+
+    # Interpolate Ball Positions before positions are derived, so every frame gets a pitch position
+    tracks["ball"] = tracker.interpolate_ball_positions(tracks["ball"])
+
+    # Get object positions
     tracker.add_position_to_tracks(tracks)
 
-    # camera movement estimator
-    camera_movement_estimator = CameraMovementEstimator(video_frames[0])
-    camera_movement_per_frame = camera_movement_estimator.get_camera_movement(video_frames,
-                                                                                read_from_stub=True,
-                                                                                stub_path='stubs/camera_movement_stub.pkl')
     camera_movement_estimator.add_adjust_positions_to_tracks(tracks,camera_movement_per_frame)
 
 
@@ -34,54 +154,84 @@ def main():
     view_transformer = ViewTransformer()
     view_transformer.add_transformed_position_to_tracks(tracks)
 
-    # Interpolate Ball Positions
-    tracks["ball"] = tracker.interpolate_ball_positions(tracks["ball"])
-
     # Speed and distance estimator
     speed_and_distance_estimator = SpeedAndDistance_Estimator()
     speed_and_distance_estimator.add_speed_and_distance_to_tracks(tracks)
 
-    # Assign Player Teams
-    team_assigner = TeamAssigner()
-    team_assigner.assign_team_color(video_frames[0], 
-                                    tracks['players'][0])
-    
-    for frame_num, player_track in enumerate(tracks['players']):
-        for player_id, track in player_track.items():
-            team = team_assigner.get_player_team(video_frames[frame_num],   
-                                                 track['bbox'],
-                                                 player_id)
-            tracks['players'][frame_num][player_id]['team'] = team 
-            tracks['players'][frame_num][player_id]['team_color'] = team_assigner.team_colors[team]
 
-    
+    # Pitch-space analytics: heatmaps, zone dwell times and team shape
+    pitch_analytics = PitchAnalytics()
+    pitch_analytics.add_tracks(tracks)
+    pitch_analytics.save('output_data/pitch_analytics.json')
+
     # Assign Ball Aquisition
     player_assigner =PlayerBallAssigner()
-    team_ball_control= []
+    assigned_teams = np.zeros(len(tracks['players']), dtype=np.int64)
+    ball_pitch_x = possession_event_engine.get_ball_pitch_x(tracks['ball'])
     for frame_num, player_track in enumerate(tracks['players']):
         ball_bbox = tracks['ball'][frame_num][1]['bbox']
         assigned_player = player_assigner.assign_ball_to_player(player_track, ball_bbox)
 
         if assigned_player != -1:
             tracks['players'][frame_num][assigned_player]['has_ball'] = True
-            team_ball_control.append(tracks['players'][frame_num][assigned_player]['team'])
-        else:
-            team_ball_control.append(team_ball_control[-1])
-    team_ball_control= np.array(team_ball_control)
-
-
-    # Draw output 
-    ## Draw object Tracks
-    output_video_frames = tracker.draw_annotations(video_frames, tracks,team_ball_control)
-
-    ## Draw Camera movement
-    output_video_frames = camera_movement_estimator.draw_camera_movement(output_video_frames,camera_movement_per_frame)
-
-    ## Draw Speed and Distance
-    speed_and_distance_estimator.draw_speed_and_distance(output_video_frames,tracks)
-
-    # Save video
-    save_video(output_video_frames, 'output_videos/output_video.avi')
+            assigned_teams[frame_num] = tracks['players'][frame_num][assigned_player]['team']
+
+        live_stats_publisher.update_possession(assigned_teams[frame_num], ball_pitch_x[frame_num])
+        live_stats_publisher.publish(frame_num, 'ball_assignment', player_track)
+
+    # Possession spells, turnovers and attack phases in one array pass
+    team_ball_control = possession_event_engine.process(assigned_teams, ball_pitch_x)
+    possession_event_engine.save('output_data/analysis_data.json')
+
+    # Per-track and possession lookups by frame or time range for reports and the viewer
+    track_index = TrackIndex(tracks, team_ball_control)
+    for team in (1, 2):
+        print(f"Team {team}: {len(track_index.get_team_possession_spells(team)['start'])} possession spells")
+
+
+    # Draw output
+    team_ball_control_frames = tracker.get_team_ball_control_frames(team_ball_control)
+
+    # Render chunk by chunk, so live stats keep flowing while the output video is written
+    if memory_plan['mode'] == 'in_memory':
+        # video_frames are no longer needed, so annotate the decoded buffers in place
+        frame_pool = None
+        chunk_size = memory_plan['detection_batch_size']
+        chunks = ((frame_offset, video_frames[frame_offset:frame_offset+chunk_size])
+                  for frame_offset in range(0, len(video_frames), chunk_size))
+    elif streaming:
+        chunks = read_video_chunks(video_path, chunk_size, frame_pool)
+    else:
+        # Through a pool of render_chunk_size reusable buffers
+        frame_pool = FramePool(first_frame.shape, chunk_size)
+        chunks = copy_chunks(video_frames, chunk_size, frame_pool)
+
+    out = open_video_writer('output_videos/output_video.avi', first_frame.shape[1], first_frame.shape[0])
+    for frame_offset, chunk_frames in chunks:
+        ## Draw object Tracks
+        chunk_frames = tracker.draw_annotations(chunk_frames, tracks,team_ball_control, in_place=True,
+                                                frame_offset=frame_offset,
+                                                team_ball_control_frames=team_ball_control_frames)
+        ## Draw Camera movement
+        chunk_frames = camera_movement_estimator.draw_camera_movement(chunk_frames,camera_movement_per_frame,
+                                                                      frame_offset=frame_offset)
+        ## Draw Speed and Distance
+        speed_and_distance_estimator.draw_speed_and_distance(chunk_frames,tracks,frame_offset=frame_offset)
+
+        for frame_num, frame in enumerate(chunk_frames, frame_offset):
+            out.write(frame)
+            live_stats_publisher.publish(frame_num, 'rendering', tracks['players'][frame_num])
+
+        # Hand the buffers back for the next chunk
+        if frame_pool is not None:
+            frame_pool.release_all(chunk_frames)
+    out.release()
+
+    # The final snapshot always goes out, with every player's last known speed and distance
+    live_stats_publisher.publish(len(tracks['players']) - 1, 'done', force=True)
+    live_stats_publisher.close()
+
+    return track_index
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,176 @@
+import json
+import numpy as np
+
+
+class PitchAnalytics():
+    def __init__(self, frame_rate=24, heatmap_bins=(12, 34), zone_grid=(3, 3), flush_interval=256):
+        # Same pitch section as ViewTransformer: x runs along court_length, y along court_width
+        self.court_length = 23.32
+        self.court_width = 68
+        self.frame_rate = frame_rate
+
+        self.heatmap_bins = heatmap_bins
+        self.zone_grid = zone_grid
+        self.num_cells = heatmap_bins[0] * heatmap_bins[1]
+        self.num_zones = zone_grid[0] * zone_grid[1]
+        self.flush_interval = flush_interval
+
+        self.team_heatmaps = {}
+        self.team_zone_frames = {}
+        self.player_heatmaps = {}
+        self.player_zone_frames = {}
+        self.player_teams = {}
+
+        # Running sums for team shape, keyed by team
+        self.team_shape_frames = {}
+        self.team_shape_sums = {}
+
+        self.frames_processed = 0
+        self.pending = {"frame": [], "track_id": [], "team": [], "x": [], "y": []}
+        self.pending_frames = 0
+
+    def update(self, player_track):
+        track_ids = []
+        teams = []
+        xs = []
+        ys = []
+        for track_id, track_info in player_track.items():
+            position = track_info.get('position_transformed')
+            team = track_info.get('team')
+            if position is None or team is None:
+                continue
+            track_ids.append(track_id)
+            teams.append(team)
+            xs.append(position[0])
+            ys.append(position[1])
+
+        self.frames_processed += 1
+        if track_ids:
+            teams = np.asarray(teams, dtype=np.int64)
+            xs = np.asarray(xs, dtype=np.float64)
+            ys = np.asarray(ys, dtype=np.float64)
+
+            self.update_team_shape(teams, xs, ys)
+
+            self.pending["frame"].append(np.full(len(track_ids), self.frames_processed - 1, dtype=np.int64))
+            self.pending["track_id"].append(np.asarray(track_ids, dtype=np.int64))
+            self.pending["team"].append(teams)
+            self.pending["x"].append(xs)
+            self.pending["y"].append(ys)
+
+        self.pending_frames += 1
+        if self.pending_frames >= self.flush_interval:
+            self.flush()
+
+    def add_tracks(self, tracks):
+        for player_track in tracks['players']:
+            self.update(player_track)
+        self.flush()
+
+    def update_team_shape(self, teams, xs, ys):
+        for team in np.unique(teams).tolist():
+            mask = teams == team
+            team_xs = xs[mask]
+            team_ys = ys[mask]
+
+            sums = self.team_shape_sums.setdefault(team, np.zeros(4))
+            # Depth along the pitch length, width across it, and the team centroid
+            sums += (team_xs.max() - team_xs.min(),
+                     team_ys.max() - team_ys.min(),
+                     team_xs.mean(),
+                     team_ys.mean())
+            self.team_shape_frames[team] = self.team_shape_frames.get(team, 0) + 1
+
+    def bin_positions(self, xs, ys):
+        x_norm = np.clip(xs / self.court_length, 0, np.nextafter(1, 0))
+        y_norm = np.clip(ys / self.court_width, 0, np.nextafter(1, 0))
+
+        cells = (x_norm * self.heatmap_bins[0]).astype(np.int64) * self.heatmap_bins[1] \
+            + (y_norm * self.heatmap_bins[1]).astype(np.int64)
+        zones = (x_norm * self.zone_grid[0]).astype(np.int64) * self.zone_grid[1] \
+            + (y_norm * self.zone_grid[1]).astype(np.int64)
+        return cells, zones
+
+    def flush(self):
+        self.pending_frames = 0
+        if not self.pending["track_id"]:
+            return
+
+        frames = np.concatenate(self.pending["frame"])
+        track_ids = np.concatenate(self.pending["track_id"])
+        teams = np.concatenate(self.pending["team"])
+        xs = np.concatenate(self.pending["x"])
+        ys = np.concatenate(self.pending["y"])
+        self.pending = {"frame": [], "track_id": [], "team": [], "x": [], "y": []}
+
+        cells, zones = self.bin_positions(xs, ys)
+
+        for team in np.unique(teams).tolist():
+            mask = teams == team
+            heatmap = self.team_heatmaps.setdefault(team, np.zeros(self.num_cells, dtype=np.int64))
+            heatmap += np.bincount(cells[mask], minlength=self.num_cells)
+
+            # A zone counts once per frame for a team, however many of its players stand in it.
+            # All rows of a frame are flushed together, so deduplicating per flush is enough
+            frame_zones = np.unique(frames[mask] * self.num_zones + zones[mask])
+            zone_frames = self.team_zone_frames.setdefault(team, np.zeros(self.num_zones, dtype=np.int64))
+            zone_frames += np.bincount(frame_zones % self.num_zones, minlength=self.num_zones)
+
+        # Group rows by player once, then bin each player's slice
+        order = np.argsort(track_ids, kind='stable')
+        sorted_ids = track_ids[order]
+        unique_ids, starts = np.unique(sorted_ids, return_index=True)
+        ends = np.append(starts[1:], len(sorted_ids))
+        for track_id, start, end in zip(unique_ids.tolist(), starts.tolist(), ends.tolist()):
+            rows = order[start:end]
+            heatmap = self.player_heatmaps.setdefault(track_id, np.zeros(self.num_cells, dtype=np.int64))
+            heatmap += np.bincount(cells[rows], minlength=self.num_cells)
+            zone_frames = self.player_zone_frames.setdefault(track_id, np.zeros(self.num_zones, dtype=np.int64))
+            zone_frames += np.bincount(zones[rows], minlength=self.num_zones)
+            self.player_teams[track_id] = int(teams[rows[-1]])
+
+    def get_team_heatmap(self, team):
+        self.flush()
+        heatmap = self.team_heatmaps.get(team, np.zeros(self.num_cells, dtype=np.int64))
+        return heatmap.reshape(self.heatmap_bins)
+
+    def get_player_heatmap(self, track_id):
+        self.flush()
+        heatmap = self.player_heatmaps.get(track_id, np.zeros(self.num_cells, dtype=np.int64))
+        return heatmap.reshape(self.heatmap_bins)
+
+    def get_results(self):
+        self.flush()
+
+        teams = {}
+        for team in sorted(set(self.team_heatmaps) | set(self.team_shape_frames)):
+            shape_frames = self.team_shape_frames.get(team, 0)
+            shape = self.team_shape_sums.get(team, np.zeros(4)) / max(shape_frames, 1)
+            teams[str(team)] = {
+                "heatmap": self.get_team_heatmap(team).tolist(),
+                "zone_seconds": (self.team_zone_frames.get(team, np.zeros(self.num_zones)) / self.frame_rate).round(2).tolist(),
+                "average_depth_m": round(float(shape[0]), 2),
+                "average_width_m": round(float(shape[1]), 2),
+                "average_centroid_m": [round(float(shape[2]), 2), round(float(shape[3]), 2)],
+            }
+
+        players = {}
+        for track_id in sorted(self.player_heatmaps):
+            players[str(track_id)] = {
+                "team": self.player_teams[track_id],
+                "heatmap": self.get_player_heatmap(track_id).tolist(),
+                "zone_seconds": (self.player_zone_frames[track_id] / self.frame_rate).round(2).tolist(),
+            }
+
+        return {
+            "frames_processed": self.frames_processed,
+            "pitch_size_m": [self.court_length, self.court_width],
+            "heatmap_bins": list(self.heatmap_bins),
+            "zone_grid": list(self.zone_grid),
+            "teams": teams,
+            "players": players,
+        }
+
+    def save(self, output_path):
+        with open(output_path, 'w') as f:
+            json.dump(self.get_results(), f, indent=2)
@@ -0,0 +1 @@
+from .possession_events import PossessionEventEngine
\ No newline at end of file
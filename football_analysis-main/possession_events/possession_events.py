@@ -0,0 +1,92 @@
+import json
+import numpy as np
+import sys
+sys.path.append('../')
+from utils import run_length_encode
+
+
+class PossessionEventEngine():
+    def __init__(self, frame_rate=24):
+        # Same pitch section as ViewTransformer; team 1 attacks towards +x, team 2 towards -x
+        self.court_length = 23.32
+        self.half_field = self.court_length / 2
+        self.frame_rate = frame_rate
+
+        self.team_ball_control = np.empty(0, dtype=np.int64)
+        self.attacking_team = np.empty(0, dtype=np.int64)
+
+    def get_ball_pitch_x(self, ball_tracks):
+        ball_x = np.full(len(ball_tracks), np.nan)
+        for frame_num, ball_track in enumerate(ball_tracks):
+            position = ball_track.get(1, {}).get('position_transformed')
+            if position is not None:
+                ball_x[frame_num] = position[0]
+        return ball_x
+
+    def forward_fill(self, values, valid):
+        # Carry the last valid value forward; positions before the first valid one stay invalid
+        last_valid = np.where(valid, np.arange(len(values)), -1)
+        np.maximum.accumulate(last_valid, out=last_valid)
+        return values[np.maximum(last_valid, 0)], last_valid >= 0
+
+    def process(self, assigned_teams, ball_pitch_x):
+        assigned_teams = np.asarray(assigned_teams, dtype=np.int64)
+        ball_pitch_x = np.asarray(ball_pitch_x, dtype=np.float64)
+
+        # Frames without an assigned player keep the previous team; frames before the first assignment are 0
+        team_ball_control, has_team = self.forward_fill(assigned_teams, assigned_teams > 0)
+        self.team_ball_control = np.where(has_team, team_ball_control, 0)
+
+        ball_x, has_ball_x = self.forward_fill(ball_pitch_x, ~np.isnan(ball_pitch_x))
+        team_1_attacking = (self.team_ball_control == 1) & has_ball_x & (ball_x > self.half_field)
+        team_2_attacking = (self.team_ball_control == 2) & has_ball_x & (ball_x < self.half_field)
+        self.attacking_team = np.where(team_1_attacking, 1, np.where(team_2_attacking, 2, 0))
+
+        return self.team_ball_control
+
+    def get_spells(self, values):
+        starts, ends, teams = run_length_encode(values)
+        keep = teams != 0
+        return starts[keep], ends[keep], teams[keep]
+
+    def get_events(self):
+        possession_starts, possession_ends, possession_teams = self.get_spells(self.team_ball_control)
+        attack_starts, attack_ends, attack_teams = self.get_spells(self.attacking_team)
+
+        # A turnover is every possession spell whose team differs from the previous spell's team
+        changed = np.flatnonzero(possession_teams[1:] != possession_teams[:-1]) + 1
+
+        return {
+            "possession_spells": np.stack((possession_starts, possession_ends, possession_teams), axis=1).tolist(),
+            "attack_phases": np.stack((attack_starts, attack_ends, attack_teams), axis=1).tolist(),
+            "turnovers": np.stack((possession_starts[changed],
+                                   possession_teams[changed - 1],
+                                   possession_teams[changed]), axis=1).tolist(),
+        }
+
+    def get_metadata(self):
+        total_frames = len(self.team_ball_control)
+        team_frames = np.bincount(self.team_ball_control, minlength=3)
+        attack_frames = np.bincount(self.attacking_team, minlength=3)
+        controlled_frames = team_frames[1] + team_frames[2]
+
+        metadata = {
+            "total_frames": int(total_frames),
+            "description": "Football analysis data exported from video processing",
+        }
+        for team in (1, 2):
+            metadata[f"team_{team}_ball_control_percent"] = round(float(team_frames[team] / max(controlled_frames, 1) * 100), 2)
+            metadata[f"team_{team}_frames"] = int(team_frames[team])
+        for team in (1, 2):
+            metadata[f"team_{team}_attack_percent"] = round(float(attack_frames[team] / max(total_frames, 1) * 100), 2)
+            metadata[f"team_{team}_attack_frames"] = int(attack_frames[team])
+        return metadata
+
+    def save(self, output_path):
+        data = {
+            "metadata": self.get_metadata(),
+            # Spells and phases are [start_frame, end_frame (exclusive), team]; turnovers are [frame, from_team, to_team]
+            "events": {"frame_rate": self.frame_rate, **self.get_events()},
+        }
+        with open(output_path, 'w') as f:
+            json.dump(data, f, indent=2)
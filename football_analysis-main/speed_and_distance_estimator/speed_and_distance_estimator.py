@@ -1,13 +1,30 @@
 import cv2
 import sys 
 sys.path.append('../')
-from utils import measure_distance ,get_foot_position
+from utils import measure_distance ,get_foot_position, TrackStateStore
 
 class SpeedAndDistance_Estimator():
-    def __init__(self):
+    def __init__(self, max_inactive_frames=None, max_tracked_players=None, spill_path=None,
+                 max_retired_players=256):
         self.frame_window=5
         self.frame_rate=24
-    
+
+        # max_tracked_players caps the number of live track ids per object type, not bytes;
+        # max_retired_players caps how many expired ids keep their total to resume from
+        self.max_inactive_frames = max_inactive_frames
+        self.max_tracked_players = max_tracked_players
+        self.max_retired_players = max_retired_players
+        self.spill_path = spill_path
+
+    def create_distance_state(self):
+        # Expired tracks spill their distance so far; recently expired ids keep only the total, so a
+        # returning id continues from it instead of restarting at 0
+        return TrackStateStore(max_inactive_frames=self.max_inactive_frames,
+                               max_entries=self.max_tracked_players,
+                               spill_path=self.spill_path,
+                               summarize=lambda distance: {"total_distance": distance},
+                               max_retired=self.max_retired_players)
+
     def add_speed_and_distance_to_tracks(self,tracks):
         total_distance= {}
 
@@ -18,6 +35,9 @@ class SpeedAndDistance_Estimator():
             for frame_num in range(0,number_of_frames, self.frame_window):
                 last_frame = min(frame_num+self.frame_window,number_of_frames-1 )
 
+                if object in total_distance:
+                    total_distance[object].set_frame(frame_num)
+
                 for track_id,_ in object_tracks[frame_num].items():
                     if track_id not in object_tracks[last_frame]:
                         continue
@@ -34,7 +54,8 @@ class SpeedAndDistance_Estimator():
                     speed_km_per_hour = speed_meteres_per_second*3.6
 
                     if object not in total_distance:
-                        total_distance[object]= {}
+                        total_distance[object]= self.create_distance_state()
+                        total_distance[object].set_frame(frame_num)
                     
                     if track_id not in total_distance[object]:
                         total_distance[object][track_id] = 0
@@ -46,10 +67,13 @@ class SpeedAndDistance_Estimator():
                             continue
                         tracks[object][frame_num_batch][track_id]['speed'] = speed_km_per_hour
                         tracks[object][frame_num_batch][track_id]['distance'] = total_distance[object][track_id]
+
+        for object_distance in total_distance.values():
+            object_distance.flush()
     
-    def draw_speed_and_distance(self,frames,tracks):
+    def draw_speed_and_distance(self,frames,tracks,frame_offset=0):
         output_frames = []
-        for frame_num, frame in enumerate(frames):
+        for frame_num, frame in enumerate(frames, frame_offset):
             for object, object_tracks in tracks.items():
                 if object == "ball" or object == "referees":
                     continue 
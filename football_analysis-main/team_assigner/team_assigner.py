@@ -1,9 +1,18 @@
 from sklearn.cluster import KMeans
+import sys 
+sys.path.append('../')
+from utils import TrackStateStore
 
 class TeamAssigner:
-    def __init__(self):
+    def __init__(self, max_inactive_frames=None, max_tracked_players=None, spill_path=None,
+                 max_retired_players=256):
         self.team_colors = {}
-        self.player_team_dict = {}
+        # Expired player ids leave the live state (and are optionally spilled to disk); one of the last
+        # max_retired_players expired ids keeps its team when it returns. Both limits count ids, not bytes
+        self.player_team_dict = TrackStateStore(max_inactive_frames=max_inactive_frames,
+                                                max_entries=max_tracked_players,
+                                                spill_path=spill_path,
+                                                max_retired=max_retired_players)
     
     def get_clustering_model(self,image):
         # Reshape the image to 2D array
@@ -56,7 +65,10 @@ class TeamAssigner:
         self.team_colors[2] = kmeans.cluster_centers_[1]
 
 
-    def get_player_team(self,frame,player_bbox,player_id):
+    def get_player_team(self,frame,player_bbox,player_id,frame_num=None):
+        if frame_num is not None and frame_num != self.player_team_dict.current_frame:
+            self.player_team_dict.set_frame(frame_num)
+
         if player_id in self.player_team_dict:
             return self.player_team_dict[player_id]
 
@@ -0,0 +1 @@
+from .track_index import TrackIndex
\ No newline at end of file
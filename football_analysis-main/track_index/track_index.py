@@ -0,0 +1,133 @@
+import numpy as np
+import sys
+sys.path.append('../')
+from utils import run_length_encode
+
+
+class TrackIndex():
+    def __init__(self, tracks, team_ball_control=None, frame_rate=24):
+        self.frame_rate = frame_rate
+        self.num_frames = len(tracks['players'])
+
+        self.track_frames = {}
+        self.track_intervals = {}
+        for object_name in ('players', 'referees'):
+            self.index_object_tracks(tracks[object_name])
+
+        self.index_ball_possession(tracks['players'])
+
+        if team_ball_control is None:
+            team_ball_control = np.zeros(self.num_frames, dtype=np.int64)
+        self.team_spells = self.build_segments(np.asarray(team_ball_control), exclude=0)
+
+    def index_object_tracks(self, object_tracks):
+        # One flat (track_id, frame_num) pass, then group by track with a single sort
+        track_ids = []
+        frame_nums = []
+        for frame_num, track in enumerate(object_tracks):
+            track_ids.extend(track.keys())
+            frame_nums.extend([frame_num] * len(track))
+        if not track_ids:
+            return
+
+        track_ids = np.asarray(track_ids, dtype=np.int64)
+        frame_nums = np.asarray(frame_nums, dtype=np.int64)
+        order = np.lexsort((frame_nums, track_ids))
+        track_ids = track_ids[order]
+        frame_nums = frame_nums[order]
+
+        unique_ids, starts = np.unique(track_ids, return_index=True)
+        ends = np.append(starts[1:], len(track_ids))
+        for track_id, start, end in zip(unique_ids.tolist(), starts.tolist(), ends.tolist()):
+            frames = frame_nums[start:end]
+            self.track_frames[track_id] = frames
+
+            # Consecutive frames collapse into [start, end) intervals
+            gaps = np.flatnonzero(np.diff(frames) != 1) + 1
+            interval_starts = frames[np.concatenate(([0], gaps))]
+            interval_ends = frames[np.concatenate((gaps - 1, [len(frames) - 1]))] + 1
+            self.track_intervals[track_id] = np.stack((interval_starts, interval_ends), axis=1)
+
+    def index_ball_possession(self, player_tracks):
+        ball_holder = np.full(self.num_frames, -1, dtype=np.int64)
+        for frame_num, player_track in enumerate(player_tracks):
+            for player_id, player in player_track.items():
+                if player.get('has_ball', False):
+                    ball_holder[frame_num] = player_id
+                    break
+        self.ball_holder = ball_holder
+        self.player_spells = self.build_segments(ball_holder, exclude=-1)
+
+        # Group the player spells once so per-player lookups never scan the match
+        self.player_spell_rows = {}
+        values = self.player_spells['value']
+        order = np.argsort(values, kind='stable')
+        unique_values, starts = np.unique(values[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        for player_id, start, end in zip(unique_values.tolist(), starts.tolist(), ends.tolist()):
+            self.player_spell_rows[player_id] = order[start:end]
+
+    def build_segments(self, values, exclude):
+        starts, ends, run_values = run_length_encode(values)
+        keep = run_values != exclude
+        return {
+            'start': starts[keep],
+            'end': ends[keep],
+            'value': run_values[keep],
+        }
+
+    def time_to_frame(self, seconds):
+        return int(round(seconds * self.frame_rate))
+
+    def frame_to_time(self, frame_num):
+        return np.asarray(frame_num) / self.frame_rate
+
+    def frame_range(self, start_frame=None, end_frame=None, start_time=None, end_time=None):
+        if start_time is not None:
+            start_frame = self.time_to_frame(start_time)
+        if end_time is not None:
+            end_frame = self.time_to_frame(end_time)
+        start_frame = 0 if start_frame is None else max(start_frame, 0)
+        end_frame = self.num_frames if end_frame is None else min(end_frame, self.num_frames)
+        return start_frame, end_frame
+
+    def slice_segments(self, segments, start_frame, end_frame):
+        # Segments are sorted and non-overlapping, so overlap with [start_frame, end_frame) is one contiguous slice
+        first = np.searchsorted(segments['end'], start_frame, side='right')
+        last = np.searchsorted(segments['start'], end_frame, side='left')
+        result = {key: column[first:last] for key, column in segments.items()}
+        result['start'] = np.maximum(result['start'], start_frame)
+        result['end'] = np.minimum(result['end'], end_frame)
+        return result
+
+    def get_track_frames(self, track_id, **frame_range):
+        frames = self.track_frames.get(track_id, np.empty(0, dtype=np.int64))
+        start_frame, end_frame = self.frame_range(**frame_range)
+        first, last = np.searchsorted(frames, (start_frame, end_frame))
+        return frames[first:last]
+
+    def get_track_intervals(self, track_id, **frame_range):
+        intervals = self.track_intervals.get(track_id, np.empty((0, 2), dtype=np.int64))
+        start_frame, end_frame = self.frame_range(**frame_range)
+        segments = self.slice_segments({'start': intervals[:, 0], 'end': intervals[:, 1]}, start_frame, end_frame)
+        return np.stack((segments['start'], segments['end']), axis=1)
+
+    def get_team_possession_spells(self, team=None, **frame_range):
+        start_frame, end_frame = self.frame_range(**frame_range)
+        spells = self.slice_segments(self.team_spells, start_frame, end_frame)
+        if team is not None:
+            mask = spells['value'] == team
+            spells = {key: column[mask] for key, column in spells.items()}
+        return spells
+
+    def get_player_possession_spells(self, player_id, **frame_range):
+        rows = self.player_spell_rows.get(player_id, np.empty(0, dtype=np.int64))
+        spells = {key: column[rows] for key, column in self.player_spells.items()}
+        start_frame, end_frame = self.frame_range(**frame_range)
+        return self.slice_segments(spells, start_frame, end_frame)
+
+    def get_player_ball_frames(self, player_id, **frame_range):
+        spells = self.get_player_possession_spells(player_id, **frame_range)
+        if len(spells['start']) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, end) for start, end in zip(spells['start'], spells['end'])])
@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from ultralytics import YOLO
+
+
+class InferenceService:
+    def __init__(self, model_path, max_batch_size=32, max_latency_ms=20):
+        # One model copy shared by every pipeline that submits frames to this service
+        self.model = YOLO(model_path)
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+
+        self.requests = queue.Queue()
+        self.closed = False
+        # Guards closed, so no request can be queued behind the shutdown marker
+        self.lock = threading.Lock()
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+
+    def submit(self, frame, **predict_kwargs):
+        future = Future()
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("InferenceService is closed")
+            self.requests.put((frame, predict_kwargs, future))
+        return future
+
+    def predict(self, frames, **predict_kwargs):
+        # Same call shape as YOLO.predict, but frames are batched together with other pipelines' frames
+        futures = [self.submit(frame, **predict_kwargs) for frame in frames]
+        return [future.result() for future in futures]
+
+    def collect_batch(self):
+        request = self.requests.get()
+        if request is None:
+            return None
+
+        # Wait at most max_latency for more frames to fill the batch
+        batch = [request]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                # Re-queue the shutdown marker so the loop exits after this batch
+                self.requests.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.collect_batch()
+            if batch is None:
+                return
+
+            try:
+                self.run_batch(batch)
+            except Exception as e:
+                # Never leave a caller waiting on a request the worker gave up on
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def run_batch(self, batch):
+        # Requests with different predict options (e.g. crop imgsz) cannot share a model call.
+        # Options may hold unhashable values such as classes=[0], so group by their repr
+        groups = {}
+        for frame, predict_kwargs, future in batch:
+            key = repr(sorted(predict_kwargs.items()))
+            groups.setdefault(key, (predict_kwargs, []))[1].append((frame, future))
+
+        for predict_kwargs, requests in groups.values():
+            try:
+                results = self.model.predict([frame for frame, _ in requests], **predict_kwargs)
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+            if len(results) != len(requests):
+                raise RuntimeError(f"Model returned {len(results)} results for {len(requests)} frames")
+            for (_, future), result in zip(requests, results):
+                future.set_result(result)
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+
+            # Requests still waiting in the queue fail instead of running after close
+            while True:
+                try:
+                    request = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is not None:
+                    request[2].set_exception(RuntimeError("InferenceService is closed"))
+            self.requests.put(None)
+        self.worker.join()
@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class TrackBuffer:
+    def __init__(self):
+        # Per-frame chunks, concatenated lazily into one column per field
+        self.frame_num_chunks = []
+        self.track_id_chunks = []
+        self.class_id_chunks = []
+        self.bbox_chunks = []
+        self.num_frames = 0
+        self.columns = None
+
+    def append(self, frame_num, track_ids, class_ids, bboxes):
+        count = len(track_ids)
+        self.num_frames = max(self.num_frames, frame_num + 1)
+        if count == 0:
+            return
+        self.frame_num_chunks.append(np.full(count, frame_num, dtype=np.int32))
+        self.track_id_chunks.append(np.asarray(track_ids, dtype=np.int64))
+        self.class_id_chunks.append(np.asarray(class_ids, dtype=np.int32))
+        self.bbox_chunks.append(np.asarray(bboxes, dtype=np.float64).reshape(-1, 4))
+        self.columns = None
+
+    def to_arrays(self):
+        if self.columns is None:
+            if self.frame_num_chunks:
+                self.columns = {
+                    "frame_num": np.concatenate(self.frame_num_chunks),
+                    "track_id": np.concatenate(self.track_id_chunks),
+                    "class_id": np.concatenate(self.class_id_chunks),
+                    "bbox": np.concatenate(self.bbox_chunks),
+                }
+            else:
+                self.columns = {
+                    "frame_num": np.empty(0, dtype=np.int32),
+                    "track_id": np.empty(0, dtype=np.int64),
+                    "class_id": np.empty(0, dtype=np.int32),
+                    "bbox": np.empty((0, 4), dtype=np.float64),
+                }
+        return self.columns
+
+    def to_tracks(self, object_class_ids):
+        # object_class_ids maps each tracks key (e.g. "players") to its class id
+        columns = self.to_arrays()
+        tracks = {object_name: [{} for _ in range(self.num_frames)] for object_name in object_class_ids}
+
+        for object_name, class_id in object_class_ids.items():
+            mask = columns["class_id"] == class_id
+            object_tracks = tracks[object_name]
+            # Convert whole columns at once; rows stay in append order so later detections win
+            for frame_num, track_id, bbox in zip(columns["frame_num"][mask].tolist(),
+                                                 columns["track_id"][mask].tolist(),
+                                                 columns["bbox"][mask].tolist()):
+                object_tracks[frame_num][track_id] = {"bbox": bbox}
+
+        return tracks
@@ -1,18 +1,27 @@
 from ultralytics import YOLO
 import supervision as sv
-import pickle
-import os
 import numpy as np
 import pandas as pd
 import cv2
 import sys 
 sys.path.append('../')
-from utils import get_center_of_bbox, get_bbox_width, get_foot_position
+from utils import get_center_of_bbox, get_bbox_width, get_foot_position, read_stub, save_stub
+from .track_buffer import TrackBuffer
 
 class Tracker:
-    def __init__(self, model_path):
-        self.model = YOLO(model_path) 
-        self.tracker = sv.ByteTrack()
+    def __init__(self, model_path=None, ball_crop_size=320, ball_crop_imgsz=640, max_ball_lost_frames=24, inference_service=None, batch_size=20):
+        # Pipelines sharing an InferenceService use its single model instead of loading their own
+        if (model_path is None) == (inference_service is None):
+            raise ValueError("Tracker needs exactly one of model_path or inference_service")
+        self.inference_service = inference_service
+        self.model = YOLO(model_path) if inference_service is None else None
+        self.batch_size = batch_size
+        self.reset_tracking()
+
+        # Second, crop-only pass for the ball; ball_crop_size=None disables it
+        self.ball_crop_size = ball_crop_size
+        self.ball_crop_imgsz = ball_crop_imgsz
+        self.max_ball_lost_frames = max_ball_lost_frames
 
     def add_position_to_tracks(sekf,tracks):
         for object, object_tracks in tracks.items():
@@ -37,69 +46,159 @@ class Tracker:
 
         return ball_positions
 
-    def detect_frames(self, frames):
-        batch_size=20 
+    def predict(self, frames, **predict_kwargs):
+        if self.inference_service is not None:
+            return self.inference_service.predict(frames, **predict_kwargs)
+        return self.model.predict(frames, **predict_kwargs)
+
+    def detect_frames(self, frames, progress_callback=None, frame_offset=0):
+        # progress_callback(frame_num) is called after each batch with the last frame detected so far
+        batch_size=self.batch_size
         detections = [] 
         for i in range(0,len(frames),batch_size):
-            detections_batch = self.model.predict(frames[i:i+batch_size],conf=0.1)
+            detections_batch = self.predict(frames[i:i+batch_size],conf=0.1)
             detections += detections_batch
+            if progress_callback is not None:
+                progress_callback(frame_offset + len(detections) - 1)
         return detections
 
-    def get_object_tracks(self, frames, read_from_stub=False, stub_path=None):
-        
-        if read_from_stub and stub_path is not None and os.path.exists(stub_path):
-            with open(stub_path,'rb') as f:
-                tracks = pickle.load(f)
-            return tracks
-
-        detections = self.detect_frames(frames)
-
-        tracks={
-            "players":[],
-            "referees":[],
-            "ball":[]
-        }
-
-        for frame_num, detection in enumerate(detections):
-            cls_names = detection.names
-            cls_names_inv = {v:k for k,v in cls_names.items()}
-
+    def predict_ball_centers(self, ball_centers):
+        # Interpolate the ball track through missed frames; frames too far from any detection count as lost
+        detected = ~np.isnan(ball_centers[:,0])
+        if not detected.any():
+            return np.empty(0, dtype=np.int64), np.empty((0,2))
+
+        frame_nums = np.arange(len(ball_centers))
+        known_frames = np.flatnonzero(detected)
+        predicted = np.stack((np.interp(frame_nums, known_frames, ball_centers[known_frames,0]),
+                              np.interp(frame_nums, known_frames, ball_centers[known_frames,1])), axis=1)
+
+        last_known = np.maximum.accumulate(np.where(detected, frame_nums, -len(frame_nums)))
+        next_known = np.minimum.accumulate(np.where(detected, frame_nums, 2*len(frame_nums))[::-1])[::-1]
+        frames_from_detection = np.minimum(frame_nums - last_known, next_known - frame_nums)
+
+        candidates = np.flatnonzero(~detected & (frames_from_detection <= self.max_ball_lost_frames))
+        return candidates, predicted[candidates]
+
+    def detect_ball_in_crops(self, frames, frame_nums, centers, ball_class, frame_offset=0):
+        # frames[0] is match frame frame_offset, so crops can be taken from one chunk of the video
+        batch_size=self.batch_size
+        ball_detections = []
+        for i in range(0,len(frame_nums),batch_size):
+            crops = []
+            offsets = []
+            for frame_num, center in zip(frame_nums[i:i+batch_size], centers[i:i+batch_size]):
+                frame = frames[frame_num - frame_offset]
+                frame_height, frame_width = frame.shape[:2]
+                crop_size = min(self.ball_crop_size, frame_width, frame_height)
+                x1 = int(np.clip(center[0] - crop_size//2, 0, frame_width - crop_size))
+                y1 = int(np.clip(center[1] - crop_size//2, 0, frame_height - crop_size))
+                crops.append(frame[y1:y1+crop_size, x1:x1+crop_size])
+                offsets.append((x1, y1))
+
+            # Crops are upscaled to ball_crop_imgsz, so the ball covers many more model input pixels
+            results = self.predict(crops, conf=0.1, imgsz=self.ball_crop_imgsz)
+            for frame_num, (x1, y1), result in zip(frame_nums[i:i+batch_size], offsets, results):
+                detection_supervision = sv.Detections.from_ultralytics(result)
+                ball_mask = detection_supervision.class_id == ball_class
+                if not ball_mask.any():
+                    continue
+                best = np.argmax(detection_supervision.confidence[ball_mask])
+                bbox = detection_supervision.xyxy[ball_mask][best] + np.array([x1, y1, x1, y1])
+                ball_detections.append((int(frame_num), bbox))
+
+        return ball_detections
+
+    def get_ball_crop_candidates(self):
+        # Frames where the full-frame pass missed the ball, with the predicted ball center for each
+        if self.ball_crop_size is None or self.class_ids.get("ball") is None:
+            return np.empty(0, dtype=np.int64), np.empty((0,2))
+        return self.predict_ball_centers(np.concatenate(self.ball_centers))
+
+    def add_ball_crop_detections(self, tracks, frames, frame_nums, centers, frame_offset=0):
+        # Candidate frames have no ball detection, so a crop detection is the frame's only ball
+        for frame_num, bbox in self.detect_ball_in_crops(frames, frame_nums, centers, self.class_ids.get("ball"), frame_offset):
+            tracks["ball"][frame_num][1] = {"bbox": bbox.tolist()}
+
+    def reset_tracking(self):
+        self.tracker = sv.ByteTrack()
+        self.track_buffer = TrackBuffer()
+        self.ball_centers = []
+        self.class_ids = {}
+
+    def track_frames(self, frames, frame_offset=0, progress_callback=None):
+        # ByteTrack state carries over between calls, so a video can be tracked one chunk at a time
+        detections = self.detect_frames(frames, progress_callback, frame_offset)
+
+        # Class mapping is the same for every frame, so resolve it once
+        if not self.class_ids and detections:
+            cls_names_inv = {v:k for k,v in detections[0].names.items()}
+            self.class_ids = {
+                "players": cls_names_inv.get('player'),
+                "goalkeeper": cls_names_inv.get('goalkeeper'),
+                "referees": cls_names_inv.get('referee'),
+                "ball": cls_names_inv.get('ball'),
+            }
+        player_class = self.class_ids.get("players")
+        goalkeeper_class = self.class_ids.get("goalkeeper")
+        referee_class = self.class_ids.get("referees")
+        ball_class = self.class_ids.get("ball")
+
+        ball_centers = np.full((len(detections), 2), np.nan)
+
+        for frame_num, detection in enumerate(detections, frame_offset):
             # Covert to supervision Detection format
             detection_supervision = sv.Detections.from_ultralytics(detection)
 
             # Convert GoalKeeper to player object
-            for object_ind , class_id in enumerate(detection_supervision.class_id):
-                if cls_names[class_id] == "goalkeeper":
-                    detection_supervision.class_id[object_ind] = cls_names_inv["player"]
+            if goalkeeper_class is not None:
+                detection_supervision.class_id[detection_supervision.class_id == goalkeeper_class] = player_class
 
             # Track Objects
             detection_with_tracks = self.tracker.update_with_detections(detection_supervision)
 
-            tracks["players"].append({})
-            tracks["referees"].append({})
-            tracks["ball"].append({})
-
-            for frame_detection in detection_with_tracks:
-                bbox = frame_detection[0].tolist()
-                cls_id = frame_detection[3]
-                track_id = frame_detection[4]
+            tracked_mask = np.isin(detection_with_tracks.class_id, [player_class, referee_class])
+            self.track_buffer.append(frame_num,
+                                     detection_with_tracks.tracker_id[tracked_mask],
+                                     detection_with_tracks.class_id[tracked_mask],
+                                     detection_with_tracks.xyxy[tracked_mask])
+
+            # Ball is not tracked; it always uses track id 1
+            ball_mask = detection_supervision.class_id == ball_class
+            ball_count = int(ball_mask.sum())
+            self.track_buffer.append(frame_num,
+                                     np.ones(ball_count, dtype=np.int64),
+                                     detection_supervision.class_id[ball_mask],
+                                     detection_supervision.xyxy[ball_mask])
+            if ball_count > 0:
+                ball_bbox = detection_supervision.xyxy[ball_mask][-1]
+                ball_centers[frame_num - frame_offset] = ((ball_bbox[0]+ball_bbox[2])/2, (ball_bbox[1]+ball_bbox[3])/2)
+
+        self.ball_centers.append(ball_centers)
+
+    def get_tracks(self):
+        return self.track_buffer.to_tracks({
+            "players": self.class_ids.get("players"),
+            "referees": self.class_ids.get("referees"),
+            "ball": self.class_ids.get("ball")
+        })
+
+    def get_object_tracks(self, frames, read_from_stub=False, stub_path=None, progress_callback=None):
+        
+        tracks = read_stub(read_from_stub, stub_path)
+        if tracks is not None:
+            return tracks
 
-                if cls_id == cls_names_inv['player']:
-                    tracks["players"][frame_num][track_id] = {"bbox":bbox}
-                
-                if cls_id == cls_names_inv['referee']:
-                    tracks["referees"][frame_num][track_id] = {"bbox":bbox}
-            
-            for frame_detection in detection_supervision:
-                bbox = frame_detection[0].tolist()
-                cls_id = frame_detection[3]
+        self.reset_tracking()
+        self.track_frames(frames, progress_callback=progress_callback)
+        tracks = self.get_tracks()
 
-                if cls_id == cls_names_inv['ball']:
-                    tracks["ball"][frame_num][1] = {"bbox":bbox}
+        # Frames where the full-frame pass missed the ball get a high-resolution crop pass near its predicted position
+        frame_nums, centers = self.get_ball_crop_candidates()
+        if len(frame_nums) > 0:
+            self.add_ball_crop_detections(tracks, frames, frame_nums, centers)
 
-        if stub_path is not None:
-            with open(stub_path,'wb') as f:
-                pickle.dump(tracks,f)
+        save_stub(stub_path, tracks)
 
         return tracks
     
@@ -164,29 +263,41 @@ class Tracker:
 
         return frame
 
-    def draw_team_ball_control(self,frame,frame_num,team_ball_control):
-        # Draw a semi-transparent rectaggle 
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (1350, 850), (1900,970), (255,255,255), -1 )
+    def draw_team_ball_control(self,frame,frame_num,team_ball_control_frames):
+        # Draw a semi-transparent rectaggle by blending only the box region towards white, in place
+        box_region = frame[850:970, 1350:1900]
         alpha = 0.4
-        cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
+        cv2.addWeighted(box_region, 1 - alpha, box_region, 0, 255 * alpha, dst=box_region)
 
-        team_ball_control_till_frame = team_ball_control[:frame_num+1]
-        # Get the number of time each team had ball control
-        team_1_num_frames = team_ball_control_till_frame[team_ball_control_till_frame==1].shape[0]
-        team_2_num_frames = team_ball_control_till_frame[team_ball_control_till_frame==2].shape[0]
-        team_1 = team_1_num_frames/(team_1_num_frames+team_2_num_frames)
-        team_2 = team_2_num_frames/(team_1_num_frames+team_2_num_frames)
+        # Get the number of time each team had ball control, from the running counts
+        team_1_num_frames = team_ball_control_frames[1][frame_num]
+        team_2_num_frames = team_ball_control_frames[2][frame_num]
+        controlled_frames = max(team_1_num_frames+team_2_num_frames, 1)
+        team_1 = team_1_num_frames/controlled_frames
+        team_2 = team_2_num_frames/controlled_frames
 
         cv2.putText(frame, f"Team 1 Ball Control: {team_1*100:.2f}%",(1400,900), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 3)
         cv2.putText(frame, f"Team 2 Ball Control: {team_2*100:.2f}%",(1400,950), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 3)
 
         return frame
 
-    def draw_annotations(self,video_frames, tracks,team_ball_control):
+    def get_team_ball_control_frames(self, team_ball_control):
+        # Running ball control counts per team, computed once instead of re-counting every frame
+        team_ball_control = np.asarray(team_ball_control)
+        return {team: np.cumsum(team_ball_control == team) for team in (1, 2)}
+
+    def draw_annotations(self,video_frames, tracks,team_ball_control, in_place=False,
+                         frame_offset=0, team_ball_control_frames=None):
+        # With in_place=True the caller hands ownership of video_frames over and they are annotated directly
+        # frame_offset is the match frame number of video_frames[0], for drawing a chunk of the video
         output_video_frames= []
-        for frame_num, frame in enumerate(video_frames):
-            frame = frame.copy()
+
+        if team_ball_control_frames is None:
+            team_ball_control_frames = self.get_team_ball_control_frames(team_ball_control)
+
+        for frame_num, frame in enumerate(video_frames, frame_offset):
+            if not in_place:
+                frame = frame.copy()
 
             player_dict = tracks["players"][frame_num]
             ball_dict = tracks["ball"][frame_num]
@@ -210,7 +321,7 @@ class Tracker:
 
 
             # Draw Team Ball Control
-            frame = self.draw_team_ball_control(frame, frame_num, team_ball_control)
+            frame = self.draw_team_ball_control(frame, frame_num, team_ball_control_frames)
 
             output_video_frames.append(frame)
 
@@ -1,2 +1,8 @@
-from .video_utils import read_video, save_video
-from .bbox_utils import get_center_of_bbox, get_bbox_width, measure_distance,measure_xy_distance,get_foot_position
\ No newline at end of file
+from .video_utils import read_video, save_video, read_video_frames_generator, read_video_chunks, get_video_properties, open_video_writer
+from .stub_utils import read_stub, save_stub
+from .frame_pool import FramePool
+from .frame_cache import FrameCache
+from .bbox_utils import get_center_of_bbox, get_bbox_width, measure_distance,measure_xy_distance,get_foot_position
+from .run_length import run_length_encode
+from .track_state import TrackStateStore
+from .memory_planner import MemoryPlanner
\ No newline at end of file
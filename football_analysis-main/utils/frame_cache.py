@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import cv2
+import numpy as np
+
+
+class FrameCache:
+    def __init__(self, cache_dir, scale=1.0, grayscale=False):
+        # Downscaled or grayscale caches are only for stages that handle such frames, read via load();
+        # CameraMovementEstimator accepts full-size grayscale. The rest of the pipeline needs full-size BGR.
+        self.cache_dir = cache_dir
+        self.scale = scale
+        self.grayscale = grayscale
+
+    def is_reduced(self):
+        return self.scale != 1.0 or self.grayscale
+
+    def cache_paths(self, video_path):
+        # Key the cache on the source file identity and the decode options
+        stat = os.stat(video_path)
+        key_source = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{self.scale}|{self.grayscale}"
+        key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()[:16]
+        base_path = os.path.join(self.cache_dir, f"{os.path.splitext(os.path.basename(video_path))[0]}_{key}")
+        return base_path + ".frames", base_path + ".json"
+
+    def is_cached(self, video_path):
+        data_path, index_path = self.cache_paths(video_path)
+        return os.path.exists(data_path) and os.path.exists(index_path)
+
+    def prepare_frame(self, frame):
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        if self.grayscale:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return frame
+
+    def build(self, video_path):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, index_path = self.cache_paths(video_path)
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise IOError(f"Could not open video: {video_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS)
+
+        # Decode once, appending raw frames so an inaccurate container frame count does not matter
+        frame_count = 0
+        frame_shape = None
+        tmp_data_path = data_path + ".tmp"
+        with open(tmp_data_path, "wb") as f:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frame = np.ascontiguousarray(self.prepare_frame(frame))
+                frame_shape = frame.shape
+                f.write(frame.data)
+                frame_count += 1
+        cap.release()
+
+        if frame_count == 0:
+            os.remove(tmp_data_path)
+            raise IOError(f"No frames could be decoded from: {video_path}")
+
+        index = {
+            "source": os.path.abspath(video_path),
+            "frame_count": frame_count,
+            "frame_shape": list(frame_shape),
+            "dtype": "uint8",
+            "fps": fps,
+            "scale": self.scale,
+            "grayscale": self.grayscale,
+        }
+
+        # Publish the index last so a half-written cache is never picked up
+        os.replace(tmp_data_path, data_path)
+        with open(index_path + ".tmp", "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(index_path + ".tmp", index_path)
+
+        return index
+
+    def load_index(self, video_path):
+        _, index_path = self.cache_paths(video_path)
+        with open(index_path, "r") as f:
+            return json.load(f)
+
+    def load(self, video_path, max_frames=None):
+        if not self.is_cached(video_path):
+            self.build(video_path)
+
+        data_path, _ = self.cache_paths(video_path)
+        index = self.load_index(video_path)
+        frame_count = index["frame_count"]
+        if max_frames is not None:
+            frame_count = min(frame_count, max_frames)
+
+        # Copy-on-write mapping: frames can be annotated in place without touching the cache file
+        return np.memmap(data_path,
+                         dtype=np.dtype(index["dtype"]),
+                         mode="c",
+                         shape=(frame_count, *index["frame_shape"]))
@@ -0,0 +1,54 @@
+import threading
+from collections import deque
+import numpy as np
+
+
+class FramePool:
+    def __init__(self, frame_shape, max_buffers, dtype=np.uint8):
+        self.frame_shape = tuple(frame_shape)
+        self.max_buffers = max_buffers
+
+        # Preallocate every buffer up front so decoding never hits the allocator
+        self.buffers = [np.empty(self.frame_shape, dtype=dtype) for _ in range(max_buffers)]
+        self.buffer_index = {id(buffer): index for index, buffer in enumerate(self.buffers)}
+        self.free_buffers = deque(range(max_buffers))
+        self.checked_out = set()
+        self.condition = threading.Condition()
+
+    def __len__(self):
+        return self.max_buffers
+
+    def available(self):
+        with self.condition:
+            return len(self.free_buffers)
+
+    def owns(self, frame):
+        return id(frame) in self.buffer_index
+
+    def acquire(self, blocking=True, timeout=None):
+        # Hand ownership of a free buffer to the caller, waiting for a release if needed
+        with self.condition:
+            if not self.free_buffers:
+                if not blocking:
+                    return None
+                if not self.condition.wait_for(lambda: len(self.free_buffers) > 0, timeout):
+                    return None
+            index = self.free_buffers.popleft()
+            self.checked_out.add(index)
+            return self.buffers[index]
+
+    def release(self, frame):
+        # Return ownership of a buffer to the pool; frames not from this pool are ignored
+        index = self.buffer_index.get(id(frame))
+        if index is None:
+            return
+        with self.condition:
+            if index not in self.checked_out:
+                raise ValueError("Frame buffer released twice")
+            self.checked_out.remove(index)
+            self.free_buffers.append(index)
+            self.condition.notify()
+
+    def release_all(self, frames):
+        for frame in frames:
+            self.release(frame)
@@ -0,0 +1,119 @@
+import os
+import shutil
+from .video_utils import get_video_properties
+
+GIB = 1024 ** 3
+MIB = 1024 ** 2
+
+
+class MemoryPlanner:
+    def __init__(self, memory_budget_bytes,
+                 model_bytes=1 * GIB,
+                 inference_bytes_per_frame=64 * MIB,
+                 track_bytes_per_frame=32 * 1024,
+                 max_detection_batch_size=20,
+                 frame_count_margin=1.05,
+                 disk_headroom_bytes=1 * GIB):
+        # Per-stage costs are rough, deliberately generous estimates; tune them per machine if needed
+        self.memory_budget_bytes = memory_budget_bytes
+        self.model_bytes = model_bytes
+        self.inference_bytes_per_frame = inference_bytes_per_frame
+        self.track_bytes_per_frame = track_bytes_per_frame
+        self.max_detection_batch_size = max_detection_batch_size
+        # Container frame counts are often slightly off, so leave some headroom
+        self.frame_count_margin = frame_count_margin
+        # Free disk space that must remain after a frame cache is written
+        self.disk_headroom_bytes = disk_headroom_bytes
+
+    def has_cache_space(self, frame_cache, video_path, cache_bytes):
+        if frame_cache.is_cached(video_path):
+            return True
+
+        # The cache directory may not exist yet; check the filesystem it will be created on
+        path = os.path.abspath(frame_cache.cache_dir)
+        while not os.path.exists(path):
+            path = os.path.dirname(path)
+        return shutil.disk_usage(path).free >= cache_bytes + self.disk_headroom_bytes
+
+    def plan(self, video_path, frame_cache=None):
+        video_properties = get_video_properties(video_path)
+        width = video_properties['width']
+        height = video_properties['height']
+
+        # Some containers report no (or a negative) frame count; then nothing may be sized by it
+        frame_count_known = video_properties['frame_count'] > 0
+        frame_count = int(video_properties['frame_count'] * self.frame_count_margin) + 1 if frame_count_known else None
+
+        frame_bytes = width * height * 3
+        estimates = {
+            "model": self.model_bytes,
+            "tracks": frame_count * self.track_bytes_per_frame if frame_count_known else 0,
+        }
+
+        # Model and per-frame track dicts stay resident in every mode
+        fixed_bytes = estimates["model"] + estimates["tracks"]
+        available_bytes = self.memory_budget_bytes - fixed_bytes
+
+        # Every check below uses the same per-frame costs as the estimates, so a plan never exceeds the budget:
+        # a detection batch slot holds the model input frame plus its inference working memory
+        inference_slot_bytes = self.inference_bytes_per_frame + frame_bytes
+        # The smallest plan is a detection batch of one and a render chunk of one frame
+        minimum_bytes = inference_slot_bytes + frame_bytes
+        if available_bytes < minimum_bytes:
+            raise MemoryError(
+                f"Memory budget of {self.memory_budget_bytes / GIB:.2f} GiB is too small for "
+                f"{width}x{height} video with {frame_count if frame_count_known else 'an unknown number of'} frames; "
+                f"at least {(fixed_bytes + minimum_bytes) / GIB:.2f} GiB is needed")
+
+        decoded_bytes = frame_count * frame_bytes if frame_count_known else None
+        if frame_count_known and decoded_bytes + inference_slot_bytes <= available_bytes:
+            # Fastest mode: every decoded frame resident, annotated in place
+            mode = "in_memory"
+            working_bytes = available_bytes - decoded_bytes
+            estimates["decoded_frames"] = decoded_bytes
+        elif (frame_count_known and frame_cache is not None and not frame_cache.is_reduced() and
+              self.has_cache_space(frame_cache, video_path, decoded_bytes)):
+            # Frames come from the memory-mapped frame cache, which the OS pages in and out on demand
+            mode = "chunked"
+            working_bytes = available_bytes
+        else:
+            # No full-video cache: every pass decodes the video again, one chunk of pooled buffers at a time
+            mode = "streaming"
+            working_bytes = available_bytes
+
+        if mode != "in_memory":
+            # Keep at least one render buffer next to the detection batch
+            working_bytes -= frame_bytes
+
+        detection_batch_size = int(min(self.max_detection_batch_size, working_bytes // inference_slot_bytes))
+        estimates["inference"] = detection_batch_size * inference_slot_bytes
+
+        if mode == "in_memory":
+            render_chunk_size = frame_count
+        else:
+            # Each chunk is decoded or copied into pooled buffers, processed and released before the next one
+            render_chunk_size = int((working_bytes + frame_bytes - estimates["inference"]) // frame_bytes)
+            if frame_count_known:
+                render_chunk_size = min(render_chunk_size, frame_count)
+            estimates["render_chunk"] = render_chunk_size * frame_bytes
+
+        estimated_peak_bytes = sum(estimates.values())
+        if estimated_peak_bytes > self.memory_budget_bytes:
+            raise MemoryError(
+                f"Planned {mode} run needs {estimated_peak_bytes / GIB:.2f} GiB, "
+                f"over the {self.memory_budget_bytes / GIB:.2f} GiB budget")
+
+        return {
+            "mode": mode,
+            "width": width,
+            "height": height,
+            "fps": video_properties['fps'],
+            "frame_count": video_properties['frame_count'] if frame_count_known else None,
+            "frame_bytes": frame_bytes,
+            "detection_batch_size": detection_batch_size,
+            "render_chunk_size": render_chunk_size,
+            "cache_bytes": decoded_bytes if mode == "chunked" else 0,
+            "estimated_bytes": estimates,
+            "estimated_peak_bytes": estimated_peak_bytes,
+            "memory_budget_bytes": self.memory_budget_bytes,
+        }
@@ -0,0 +1,13 @@
+import numpy as np
+
+def run_length_encode(values):
+    # Returns (starts, ends, run_values) with ends exclusive
+    values = np.asarray(values)
+    if len(values) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, values[:0]
+
+    change_points = np.flatnonzero(values[1:] != values[:-1]) + 1
+    starts = np.concatenate(([0], change_points))
+    ends = np.concatenate((change_points, [len(values)]))
+    return starts, ends, values[starts]
@@ -0,0 +1,16 @@
+import os
+import pickle
+
+
+def read_stub(read_from_stub, stub_path):
+    # None means there is no stub to use and the stage has to run
+    if read_from_stub and stub_path is not None and os.path.exists(stub_path):
+        with open(stub_path, 'rb') as f:
+            return pickle.load(f)
+    return None
+
+
+def save_stub(stub_path, obj):
+    if stub_path is not None:
+        with open(stub_path, 'wb') as f:
+            pickle.dump(obj, f)
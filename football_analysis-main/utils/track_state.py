@@ -0,0 +1,120 @@
+import json
+from collections import OrderedDict
+
+
+def _to_json(value):
+    # numpy scalars and arrays coming from the trackers
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+class TrackStateStore:
+    def __init__(self, max_inactive_frames=None, max_entries=None, spill_path=None, summarize=None,
+                 max_retired=0):
+        # None for both limits keeps every track id, matching a plain dict.
+        # max_entries is a number of live track ids, not a size in bytes.
+        self.max_inactive_frames = max_inactive_frames
+        self.max_entries = max_entries
+        self.spill_path = spill_path
+        self.summarize = summarize
+
+        # The max_retired most recently expired ids keep their value (id -> value) and resume it if they
+        # return; an id that is older than that, or any id with max_retired=0, starts over as a new track
+        self.max_retired = max_retired
+        self.retired = OrderedDict()
+
+        self.values = OrderedDict()
+        self.last_seen = {}
+        self.current_frame = 0
+        self.spilled_count = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, track_id):
+        return track_id in self.values or self.resume(track_id)
+
+    def __getitem__(self, track_id):
+        if track_id not in self.values:
+            self.resume(track_id)
+        value = self.values[track_id]
+        self.touch(track_id)
+        return value
+
+    def __setitem__(self, track_id, value):
+        self.values[track_id] = value
+        self.touch(track_id)
+        if self.max_entries is not None and len(self.values) > self.max_entries:
+            self.expire()
+
+    def get(self, track_id, default=None):
+        if track_id not in self:
+            return default
+        return self[track_id]
+
+    def items(self):
+        return self.values.items()
+
+    def resume(self, track_id):
+        if track_id not in self.retired:
+            return False
+        self[track_id] = self.retired.pop(track_id)
+        return True
+
+    def touch(self, track_id):
+        # Keep values ordered by last activity so expiry only ever looks at the front
+        self.values.move_to_end(track_id)
+        self.last_seen[track_id] = self.current_frame
+
+    def set_frame(self, frame_num):
+        self.current_frame = frame_num
+        self.expire()
+
+    def expire(self):
+        expired = []
+        while self.values:
+            track_id = next(iter(self.values))
+            inactive = (self.max_inactive_frames is not None and
+                        self.current_frame - self.last_seen[track_id] > self.max_inactive_frames)
+            over_limit = self.max_entries is not None and len(self.values) > self.max_entries
+            if not inactive and not over_limit:
+                break
+            expired.append((track_id, self.values.pop(track_id), self.last_seen.pop(track_id)))
+
+        if expired:
+            self.retire(expired)
+            self.spill(expired)
+        return expired
+
+    def retire(self, expired):
+        if self.max_retired <= 0:
+            return
+        # Least recently expired ids are forgotten first, so retired state stays bounded too
+        for track_id, value, _ in expired:
+            self.retired[track_id] = value
+            self.retired.move_to_end(track_id)
+        while len(self.retired) > self.max_retired:
+            self.retired.popitem(last=False)
+
+    def spill(self, expired):
+        self.spilled_count += len(expired)
+        if self.spill_path is None:
+            return
+
+        # Per-track summaries are appended as JSON lines; a resumed id is spilled again when it
+        # expires, so the last record for a track id holds its final summary
+        with open(self.spill_path, 'a') as f:
+            for track_id, value, last_seen in expired:
+                summary = self.summarize(value) if self.summarize is not None else value
+                record = {"track_id": track_id, "last_seen_frame": last_seen, "summary": summary}
+                f.write(json.dumps(record, default=_to_json) + "\n")
+
+    def flush(self):
+        # Spill everything still held, e.g. at the end of a session
+        expired = [(track_id, value, self.last_seen[track_id]) for track_id, value in self.values.items()]
+        self.values.clear()
+        self.last_seen.clear()
+        self.retired.clear()
+        if expired:
+            self.spill(expired)
@@ -1,18 +1,85 @@
 import cv2
 
-def read_video(video_path):
+def get_video_properties(video_path):
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {video_path}")
+
+    properties = {
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+    }
+    cap.release()
+    return properties
+
+def _read_frame(cap, frame_pool):
+    if frame_pool is None:
+        return cap.read()
+
+    # Decode straight into a pooled buffer; fall back to a fresh array once the pool is exhausted
+    buffer = frame_pool.acquire(blocking=False)
+    if buffer is None:
+        return cap.read()
+
+    ret, frame = cap.read(buffer)
+    if not ret or frame is not buffer:
+        frame_pool.release(buffer)
+    return ret, frame
+
+def read_video(video_path, frame_pool=None, frame_cache=None):
+    # A frame cache serves zero-copy views into its memory-mapped file, decoding the video only on first use
+    if frame_cache is not None:
+        if frame_cache.is_reduced():
+            raise ValueError("read_video needs full-size BGR frames; read a downscaled or grayscale "
+                             "FrameCache with frame_cache.load() from a stage that supports it")
+        return list(frame_cache.load(video_path))
+
     cap = cv2.VideoCapture(video_path)
     frames = []
     while True:
-        ret, frame = cap.read()
+        ret, frame = _read_frame(cap, frame_pool)
         if not ret:
             break
         frames.append(frame)
+    cap.release()
     return frames
 
-def save_video(ouput_video_frames,output_video_path):
+def read_video_frames_generator(video_path, frame_pool=None):
+    # Frames taken from frame_pool are owned by the consumer until it calls frame_pool.release(frame)
+    cap = cv2.VideoCapture(video_path)
+    frame_num = 0
+    try:
+        while True:
+            ret, frame = _read_frame(cap, frame_pool)
+            if not ret:
+                break
+            yield frame_num, frame
+            frame_num += 1
+    finally:
+        cap.release()
+
+def read_video_chunks(video_path, chunk_size, frame_pool=None):
+    # Yields (frame_offset, frames) with at most chunk_size frames; release pooled frames before asking for the next chunk
+    chunk_frames = []
+    frame_offset = 0
+    for frame_num, frame in read_video_frames_generator(video_path, frame_pool):
+        if not chunk_frames:
+            frame_offset = frame_num
+        chunk_frames.append(frame)
+        if len(chunk_frames) == chunk_size:
+            yield frame_offset, chunk_frames
+            chunk_frames = []
+    if chunk_frames:
+        yield frame_offset, chunk_frames
+
+def open_video_writer(output_video_path, frame_width, frame_height):
     fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    out = cv2.VideoWriter(output_video_path, fourcc, 24, (ouput_video_frames[0].shape[1], ouput_video_frames[0].shape[0]))
+    return cv2.VideoWriter(output_video_path, fourcc, 24, (frame_width, frame_height))
+
+def save_video(ouput_video_frames,output_video_path):
+    out = open_video_writer(output_video_path, ouput_video_frames[0].shape[1], ouput_video_frames[0].shape[0])
     for frame in ouput_video_frames:
         out.write(frame)
     out.release()
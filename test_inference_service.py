@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script to verify InferenceService batching, error propagation and
+close semantics, using a fake YOLO model
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+import time
+import types
+from concurrent.futures import wait
+
+# inference_service.py only needs ultralytics.YOLO; replace it with a fake model
+# before loading the module directly
+ultralytics = types.ModuleType('ultralytics')
+
+
+class FakeYOLO:
+    def __init__(self, model_path):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def predict(self, frames, **predict_kwargs):
+        self.release.wait()
+        self.calls.append((len(frames), predict_kwargs))
+        if predict_kwargs.get('fail'):
+            raise ValueError("model failed")
+        if predict_kwargs.get('short'):
+            return [(frame, predict_kwargs) for frame in frames[:-1]]
+        return [(frame, predict_kwargs) for frame in frames]
+
+
+ultralytics.YOLO = FakeYOLO
+sys.modules.setdefault('ultralytics', ultralytics)
+
+SERVICE_PATH = os.path.join(os.path.dirname(__file__), 'football_analysis-main', 'trackers', 'inference_service.py')
+spec = importlib.util.spec_from_file_location('inference_service', SERVICE_PATH)
+inference_service = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(inference_service)
+InferenceService = inference_service.InferenceService
+
+
+def make_service(**kwargs):
+    service = InferenceService('fake.pt', **kwargs)
+    # Make sure the fake model is used even if another test loaded the real ultralytics
+    service.model = FakeYOLO('fake.pt')
+    return service
+
+
+def test_batching():
+    print("Testing that concurrent frames are batched per predict options...\n")
+    service = make_service(max_batch_size=16, max_latency_ms=20)
+    try:
+        # Hold the model on a first request so the next ones pile up in the queue
+        service.model.release.clear()
+        first = service.submit('warmup')
+        time.sleep(0.2)
+        futures = [service.submit(i, conf=0.1) for i in range(6)]
+        futures += [service.submit(i, conf=0.1, classes=[0]) for i in range(3)]
+        service.model.release.set()
+
+        assert first.result(timeout=5) == ('warmup', {})
+        results = [future.result(timeout=5) for future in futures]
+        assert [frame for frame, _ in results] == list(range(6)) + list(range(3))
+        assert results[-1][1] == {'conf': 0.1, 'classes': [0]}
+
+        # Unhashable options such as classes=[0] get their own model call
+        batch_sizes = sorted(size for size, _ in service.model.calls[1:])
+        assert batch_sizes == [3, 6], service.model.calls
+        assert service.predict(['a', 'b'], imgsz=640) == [('a', {'imgsz': 640}), ('b', {'imgsz': 640})]
+    finally:
+        service.close()
+    print("  ✓ PASS\n")
+
+
+def test_error_propagation():
+    print("Testing that model errors reach every caller...\n")
+    service = make_service()
+    try:
+        futures = [service.submit(i, fail=True) for i in range(3)]
+        wait(futures, timeout=5)
+        for future in futures:
+            assert isinstance(future.exception(timeout=0), ValueError)
+
+        # Fewer results than frames must not leave a caller waiting
+        futures = [service.submit(i, short=True) for i in range(2)]
+        wait(futures, timeout=5)
+        assert all(future.done() for future in futures)
+        assert any(isinstance(future.exception(), RuntimeError) for future in futures)
+
+        # The worker survives and keeps serving
+        assert service.predict([1]) == [(1, {})]
+    finally:
+        service.close()
+    print("  ✓ PASS\n")
+
+
+def test_close():
+    print("Testing close semantics...\n")
+    service = make_service(max_batch_size=1)
+    service.model.release.clear()
+    running = service.submit('running')
+    time.sleep(0.05)
+    queued = [service.submit(i) for i in range(5)]
+
+    closer = threading.Thread(target=service.close)
+    closer.start()
+    time.sleep(0.05)
+    service.model.release.set()
+    closer.join(timeout=5)
+    assert not closer.is_alive(), "close() did not return"
+
+    # The request already in the model finishes; queued ones fail instead of hanging
+    assert running.result(timeout=1) == ('running', {})
+    for future in queued:
+        assert isinstance(future.exception(timeout=1), RuntimeError)
+
+    try:
+        service.submit('late')
+        assert False, "submit after close did not raise"
+    except RuntimeError:
+        pass
+
+    # Closing twice is harmless
+    service.close()
+    print("  ✓ PASS\n")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("InferenceService Test Suite")
+    print("="*60 + "\n")
+
+    try:
+        test_batching()
+        test_error_propagation()
+        test_close()
+    except AssertionError as e:
+        print(f"✗ FAIL: {e}")
+        sys.exit(1)
+
+    print("="*60)
+    print("✓ All tests PASSED!")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script to verify MemoryPlanner mode thresholds, disk-space checks and
+that no returned plan exceeds its memory budget
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'football_analysis-main'))
+import utils.memory_planner as memory_planner
+from utils import MemoryPlanner
+
+MIB = 1024 ** 2
+GIB = 1024 ** 3
+WIDTH, HEIGHT = 1920, 1080
+FRAME_BYTES = WIDTH * HEIGHT * 3
+MODEL_BYTES = 1 * GIB
+INFERENCE_BYTES = 64 * MIB
+TRACK_BYTES = 32 * 1024
+
+
+def fake_video(frame_count):
+    memory_planner.get_video_properties = lambda video_path: {
+        "width": WIDTH, "height": HEIGHT, "fps": 24.0, "frame_count": frame_count,
+    }
+
+
+class FakeFrameCache:
+    def __init__(self, cache_dir, cached=False, reduced=False):
+        self.cache_dir = cache_dir
+        self.cached = cached
+        self.reduced = reduced
+
+    def is_cached(self, video_path):
+        return self.cached
+
+    def is_reduced(self):
+        return self.reduced
+
+
+def planned_frames(frame_count):
+    return int(frame_count * 1.05) + 1
+
+
+def in_memory_threshold(frame_count):
+    frames = planned_frames(frame_count)
+    return MODEL_BYTES + frames * TRACK_BYTES + frames * FRAME_BYTES + INFERENCE_BYTES + FRAME_BYTES
+
+
+def plan(budget, frame_cache=None):
+    return MemoryPlanner(budget).plan('video.mp4', frame_cache=frame_cache)
+
+
+def test_in_memory_threshold():
+    print("Testing the in_memory threshold...\n")
+    fake_video(750)
+    threshold = in_memory_threshold(750)
+
+    result = plan(threshold)
+    assert result["mode"] == "in_memory"
+    assert result["detection_batch_size"] == 1
+    assert result["estimated_peak_bytes"] <= threshold
+
+    result = plan(threshold - 1)
+    assert result["mode"] == "streaming"
+    assert result["estimated_peak_bytes"] <= threshold - 1
+    print("  ✓ PASS\n")
+
+
+def test_minimum_budget():
+    print("Testing the smallest budget that still gets a plan...\n")
+    fake_video(750)
+    frames = planned_frames(750)
+    minimum = MODEL_BYTES + frames * TRACK_BYTES + INFERENCE_BYTES + 2 * FRAME_BYTES
+
+    result = plan(minimum)
+    assert result["mode"] == "streaming"
+    assert result["detection_batch_size"] == 1 and result["render_chunk_size"] == 1
+    assert result["estimated_peak_bytes"] == minimum
+
+    try:
+        plan(minimum - 1)
+        assert False, "a budget below the minimum did not raise MemoryError"
+    except MemoryError:
+        pass
+    print("  ✓ PASS\n")
+
+
+def test_plans_never_exceed_budget():
+    print("Testing that plans stay within budget across budgets...\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for frame_count in (1, 750, 9000, 0):
+            fake_video(frame_count)
+            for frame_cache in (None, FakeFrameCache(tmp, cached=True)):
+                for budget in range(int(1.2 * GIB), 40 * GIB, 97 * MIB):
+                    try:
+                        result = plan(budget, frame_cache)
+                    except MemoryError:
+                        continue
+                    assert result["estimated_peak_bytes"] <= budget, (frame_count, budget, result["mode"])
+                    assert result["detection_batch_size"] >= 1 and result["render_chunk_size"] >= 1
+    print("  ✓ PASS\n")
+
+
+def test_unknown_frame_count():
+    print("Testing that an unknown frame count is never planned in memory...\n")
+    for frame_count in (0, -1):
+        fake_video(frame_count)
+        result = plan(64 * GIB, FakeFrameCache(tempfile.gettempdir(), cached=True))
+        assert result["mode"] == "streaming"
+        assert result["frame_count"] is None
+    print("  ✓ PASS\n")
+
+
+def test_chunked_needs_disk_space():
+    print("Testing that chunked mode needs an existing cache or free disk space...\n")
+    fake_video(9000)
+    budget = 4 * GIB
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, 'not', 'created', 'yet')
+
+        assert plan(budget, FakeFrameCache(cache_dir, cached=True))["mode"] == "chunked"
+        assert plan(budget)["mode"] == "streaming"
+        assert plan(budget, FakeFrameCache(cache_dir, cached=True, reduced=True))["mode"] == "streaming"
+
+        # Not cached yet: the decision follows the free space on the cache's filesystem
+        planner = MemoryPlanner(budget, disk_headroom_bytes=0)
+        result = planner.plan('video.mp4', frame_cache=FakeFrameCache(cache_dir))
+        assert result["mode"] == "chunked"
+        assert result["cache_bytes"] == planned_frames(9000) * FRAME_BYTES
+
+        planner = MemoryPlanner(budget, disk_headroom_bytes=2 ** 62)
+        assert planner.plan('video.mp4', frame_cache=FakeFrameCache(cache_dir))["mode"] == "streaming"
+    print("  ✓ PASS\n")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("MemoryPlanner Test Suite")
+    print("="*60 + "\n")
+
+    try:
+        test_in_memory_threshold()
+        test_minimum_budget()
+        test_plans_never_exceed_budget()
+        test_unknown_frame_count()
+        test_chunked_needs_disk_space()
+    except AssertionError as e:
+        print(f"✗ FAIL: {e}")
+        sys.exit(1)
+
+    print("="*60)
+    print("✓ All tests PASSED!")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script to verify PitchAnalytics binning, edge clipping, team zone
+dwell time and flush-boundary behaviour
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'football_analysis-main'))
+from pitch_analytics import PitchAnalytics
+
+FRAME_RATE = 10
+
+
+def player(team, x, y):
+    return {"team": team, "position_transformed": [x, y]}
+
+
+def make_tracks(num_frames=25, seed=0):
+    """
+    Random positions for two teams of five, with some players off the
+    pitch section or without a position
+    """
+    rng = np.random.default_rng(seed)
+    tracks = {"players": []}
+    for frame_num in range(num_frames):
+        player_track = {}
+        for track_id in range(1, 11):
+            x = rng.uniform(-3, 26)
+            y = rng.uniform(-5, 75)
+            player_track[track_id] = player(1 if track_id <= 5 else 2, x, y)
+        if frame_num % 4 == 0:
+            player_track[3]["position_transformed"] = None
+        tracks["players"].append(player_track)
+    return tracks
+
+
+def test_binning_and_clipping():
+    print("Testing heatmap and zone binning with edge clipping...\n")
+    analytics = PitchAnalytics(frame_rate=FRAME_RATE, heatmap_bins=(2, 4), zone_grid=(2, 2))
+
+    xs = np.array([0.0, 23.32, -5.0, 11.0, 12.0, 30.0])
+    ys = np.array([0.0, 68.0, -1.0, 16.0, 18.0, 100.0])
+    cells, zones = analytics.bin_positions(xs, ys)
+
+    # Positions on or past the far edges fall in the last cell instead of out of range
+    assert cells.tolist() == [0, 7, 0, 0, 5, 7]
+    assert zones.tolist() == [0, 3, 0, 0, 2, 3]
+    print("  ✓ PASS\n")
+
+
+def test_team_zone_seconds_are_dwell_time():
+    print("Testing team zone seconds count each frame once...\n")
+    analytics = PitchAnalytics(frame_rate=FRAME_RATE, zone_grid=(1, 1))
+    # Three team 1 players in the single zone for 5 frames is 0.5 s, not 1.5 s
+    tracks = {"players": [{1: player(1, 5, 5), 2: player(1, 6, 6), 3: player(1, 7, 7)} for _ in range(5)]}
+    analytics.add_tracks(tracks)
+    results = analytics.get_results()
+
+    assert results["teams"]["1"]["zone_seconds"] == [0.5]
+    assert results["players"]["1"]["zone_seconds"] == [0.5]
+    assert int(analytics.get_team_heatmap(1).sum()) == 15
+
+    analytics = PitchAnalytics(frame_rate=FRAME_RATE)
+    tracks = make_tracks()
+    analytics.add_tracks(tracks)
+    results = analytics.get_results()
+    duration = len(tracks["players"]) / FRAME_RATE
+    for team in ("1", "2"):
+        zone_seconds = results["teams"][team]["zone_seconds"]
+        assert max(zone_seconds) <= duration
+        # Players of one team can spread over several zones, so the sum may exceed the duration,
+        # but never the number of zones the team occupies per frame
+        assert sum(zone_seconds) <= duration * 5
+    print("  ✓ PASS\n")
+
+
+def test_flush_boundaries():
+    print("Testing that results do not depend on the flush interval...\n")
+    tracks = make_tracks()
+
+    reference = PitchAnalytics(frame_rate=FRAME_RATE, flush_interval=1000)
+    reference.add_tracks(tracks)
+    expected = reference.get_results()
+
+    for flush_interval in (1, 3, 7):
+        analytics = PitchAnalytics(frame_rate=FRAME_RATE, flush_interval=flush_interval)
+        analytics.add_tracks(tracks)
+        assert analytics.get_results() == expected, f"flush_interval={flush_interval} differs"
+
+    # Reading results mid-stream flushes, and later frames are still counted
+    analytics = PitchAnalytics(frame_rate=FRAME_RATE, flush_interval=1000)
+    for frame_num, player_track in enumerate(tracks["players"]):
+        analytics.update(player_track)
+        if frame_num == 10:
+            analytics.get_results()
+    assert analytics.get_results() == expected
+    assert expected["frames_processed"] == len(tracks["players"])
+    print("  ✓ PASS\n")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("PitchAnalytics Test Suite")
+    print("="*60 + "\n")
+
+    try:
+        test_binning_and_clipping()
+        test_team_zone_seconds_are_dwell_time()
+        test_flush_boundaries()
+    except AssertionError as e:
+        print(f"✗ FAIL: {e}")
+        sys.exit(1)
+
+    print("="*60)
+    print("✓ All tests PASSED!")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script to verify PossessionEventEngine possession spells, turnovers
+and attack phases
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'football_analysis-main'))
+from possession_events import PossessionEventEngine
+
+# Team 1 attacks towards +x, team 2 towards -x; the halfway line is at 11.66
+ASSIGNED_TEAMS = [0, 0, 1, 0, 1, 2, 2, 0, 0, 1, 0]
+BALL_PITCH_X = [5, np.nan, 15, 15, np.nan, 8, 15, 15, 5, 5, 20]
+
+
+def test_team_ball_control():
+    print("Testing team ball control forward fill...\n")
+    engine = PossessionEventEngine()
+    team_ball_control = engine.process(ASSIGNED_TEAMS, BALL_PITCH_X)
+
+    # Frames before the first assignment have no team; later gaps keep the previous team
+    assert team_ball_control.tolist() == [0, 0, 1, 1, 1, 2, 2, 2, 2, 1, 1]
+    assert engine.attacking_team.tolist() == [0, 0, 1, 1, 1, 2, 0, 0, 2, 0, 1]
+    print("  ✓ PASS\n")
+
+
+def test_events():
+    print("Testing possession spells, turnovers and attack phases...\n")
+    engine = PossessionEventEngine()
+    engine.process(ASSIGNED_TEAMS, BALL_PITCH_X)
+    events = engine.get_events()
+
+    # [start_frame, end_frame (exclusive), team]
+    assert events["possession_spells"] == [[2, 5, 1], [5, 9, 2], [9, 11, 1]]
+    assert events["attack_phases"] == [[2, 5, 1], [5, 6, 2], [8, 9, 2], [10, 11, 1]]
+    # [frame, from_team, to_team]; the first spell is not a turnover
+    assert events["turnovers"] == [[5, 1, 2], [9, 2, 1]]
+    print("  ✓ PASS\n")
+
+
+def test_no_assignment():
+    print("Testing a match without any ball assignment...\n")
+    engine = PossessionEventEngine()
+    engine.process(np.zeros(6, dtype=np.int64), np.full(6, np.nan))
+    events = engine.get_events()
+
+    assert engine.team_ball_control.tolist() == [0] * 6
+    assert engine.attacking_team.tolist() == [0] * 6
+    assert events == {"possession_spells": [], "attack_phases": [], "turnovers": []}
+
+    metadata = engine.get_metadata()
+    assert metadata["total_frames"] == 6
+    assert metadata["team_1_ball_control_percent"] == 0
+    assert metadata["team_2_attack_frames"] == 0
+    print("  ✓ PASS\n")
+
+
+def test_metadata():
+    print("Testing Qt-compatible metadata...\n")
+    engine = PossessionEventEngine()
+    engine.process(ASSIGNED_TEAMS, BALL_PITCH_X)
+    metadata = engine.get_metadata()
+
+    # Ball control is a share of controlled frames, attack a share of all frames
+    assert metadata["team_1_frames"] == 5
+    assert metadata["team_2_frames"] == 4
+    assert metadata["team_1_ball_control_percent"] == round(5 / 9 * 100, 2)
+    assert metadata["team_1_attack_frames"] == 4
+    assert metadata["team_2_attack_percent"] == round(2 / 11 * 100, 2)
+    print("  ✓ PASS\n")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("PossessionEventEngine Test Suite")
+    print("="*60 + "\n")
+
+    try:
+        test_team_ball_control()
+        test_events()
+        test_no_assignment()
+        test_metadata()
+    except AssertionError as e:
+        print(f"✗ FAIL: {e}")
+        sys.exit(1)
+
+    print("="*60)
+    print("✓ All tests PASSED!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that TrackBuffer.to_tracks builds the same tracks
+structure as the original per-element loop in Tracker.get_object_tracks
+"""
+
+import importlib.util
+import os
+import sys
+
+import numpy as np
+
+# Load track_buffer.py directly so the test does not need ultralytics/supervision
+TRACK_BUFFER_PATH = os.path.join(os.path.dirname(__file__), 'football_analysis-main', 'trackers', 'track_buffer.py')
+spec = importlib.util.spec_from_file_location('track_buffer', TRACK_BUFFER_PATH)
+track_buffer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(track_buffer)
+TrackBuffer = track_buffer.TrackBuffer
+
+BALL, GOALKEEPER, PLAYER, REFEREE = 0, 1, 2, 3
+
+
+def make_frames(num_frames=30, seed=0):
+    """
+    Random per-frame detections: (xyxy, class_id, tracker_id) as ByteTrack would return them
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for frame_num in range(num_frames):
+        count = int(rng.integers(0, 8))
+        xyxy = rng.uniform(0, 1000, size=(count, 4))
+        class_id = rng.integers(0, 4, size=count)
+        tracker_id = rng.integers(1, 20, size=count)
+        # Some frames without any detections, including the last one
+        if frame_num % 7 == 0 or frame_num == num_frames - 1:
+            xyxy, class_id, tracker_id = xyxy[:0], class_id[:0], tracker_id[:0]
+        frames.append((xyxy, class_id, tracker_id))
+    return frames
+
+
+def reference_tracks(frames):
+    """
+    The original element-by-element conversion
+    """
+    tracks = {"players": [], "referees": [], "ball": []}
+    for frame_num, (xyxy, class_id, tracker_id) in enumerate(frames):
+        class_id = class_id.copy()
+        for object_ind, cls in enumerate(class_id):
+            if cls == GOALKEEPER:
+                class_id[object_ind] = PLAYER
+
+        tracks["players"].append({})
+        tracks["referees"].append({})
+        tracks["ball"].append({})
+
+        for bbox, cls, track_id in zip(xyxy, class_id, tracker_id):
+            if cls == PLAYER:
+                tracks["players"][frame_num][track_id] = {"bbox": bbox.tolist()}
+            if cls == REFEREE:
+                tracks["referees"][frame_num][track_id] = {"bbox": bbox.tolist()}
+
+        for bbox, cls in zip(xyxy, class_id):
+            if cls == BALL:
+                tracks["ball"][frame_num][1] = {"bbox": bbox.tolist()}
+    return tracks
+
+
+def buffered_tracks(frames):
+    """
+    The vectorized conversion as done in Tracker.get_object_tracks
+    """
+    buffer = TrackBuffer()
+    for frame_num, (xyxy, class_id, tracker_id) in enumerate(frames):
+        class_id = class_id.copy()
+        class_id[class_id == GOALKEEPER] = PLAYER
+
+        tracked_mask = np.isin(class_id, [PLAYER, REFEREE])
+        buffer.append(frame_num, tracker_id[tracked_mask], class_id[tracked_mask], xyxy[tracked_mask])
+
+        ball_mask = class_id == BALL
+        buffer.append(frame_num, np.ones(int(ball_mask.sum()), dtype=np.int64), class_id[ball_mask], xyxy[ball_mask])
+
+    return buffer.to_tracks({"players": PLAYER, "referees": REFEREE, "ball": BALL})
+
+
+def test_to_tracks_matches_reference():
+    print("Testing TrackBuffer.to_tracks against the per-element loop...\n")
+    frames = make_frames()
+    expected = reference_tracks(frames)
+    actual = buffered_tracks(frames)
+
+    assert actual == expected, "TrackBuffer produced different tracks"
+    for object_name in expected:
+        assert len(actual[object_name]) == len(frames)
+    print(f"  {len(frames)} frames, identical tracks for players, referees and ball")
+    print("  ✓ PASS\n")
+
+
+def test_empty_buffer():
+    print("Testing an empty TrackBuffer...\n")
+    buffer = TrackBuffer()
+    assert buffer.to_tracks({"players": PLAYER}) == {"players": []}
+    assert buffer.to_arrays()["bbox"].shape == (0, 4)
+    print("  ✓ PASS\n")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("TrackBuffer Test Suite")
+    print("="*60 + "\n")
+
+    try:
+        test_to_tracks_matches_reference()
+        test_empty_buffer()
+    except AssertionError as e:
+        print(f"✗ FAIL: {e}")
+        sys.exit(1)
+
+    print("="*60)
+    print("✓ All tests PASSED!")
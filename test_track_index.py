@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script to verify TrackIndex range slicing and per-player queries
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'football_analysis-main'))
+from track_index import TrackIndex
+
+NUM_FRAMES = 20
+FRAME_RATE = 20
+
+
+def make_tracks():
+    """
+    Player 17 is visible on frames 0-9 and 12-19 and holds the ball on
+    frames 3-4, 7 and 15-19; player 4 holds it on frames 5-6 and 9-14
+    """
+    tracks = {"players": [], "referees": [], "ball": []}
+    for frame_num in range(NUM_FRAMES):
+        players = {4: {"bbox": [0, 0, 10, 10]}}
+        if frame_num < 10 or frame_num >= 12:
+            players[17] = {"bbox": [20, 20, 30, 30]}
+        tracks["players"].append(players)
+        tracks["referees"].append({2: {"bbox": [40, 40, 50, 50]}} if frame_num % 2 == 0 else {})
+        tracks["ball"].append({1: {"bbox": [5, 5, 6, 6]}})
+
+    for frame_num in (3, 4, 7, 15, 16, 17, 18, 19):
+        tracks["players"][frame_num][17]["has_ball"] = True
+    for frame_num in (5, 6, 9, 10, 11, 12, 13, 14):
+        tracks["players"][frame_num][4]["has_ball"] = True
+
+    team_ball_control = np.array([0, 0, 0] + [1] * 2 + [2] * 2 + [1] + [1] + [2] * 6 + [1] * 5)
+    return tracks, team_ball_control
+
+
+def spells_as_list(spells):
+    return [[int(start), int(end)] for start, end in zip(spells['start'], spells['end'])]
+
+
+def test_track_queries():
+    print("Testing per-track frames and intervals...\n")
+    tracks, team_ball_control = make_tracks()
+    index = TrackIndex(tracks, team_ball_control, frame_rate=FRAME_RATE)
+
+    assert index.get_track_intervals(17).tolist() == [[0, 10], [12, 20]]
+    assert index.get_track_intervals(17, start_frame=5, end_frame=14).tolist() == [[5, 10], [12, 14]]
+    assert index.get_track_frames(17, start_frame=8, end_frame=13).tolist() == [8, 9, 12]
+    assert index.get_track_frames(2, end_frame=6).tolist() == [0, 2, 4]
+    assert len(index.get_track_frames(99)) == 0
+    assert index.get_track_intervals(99).shape == (0, 2)
+    print("  ✓ PASS\n")
+
+
+def test_player_possession_spells():
+    print("Testing per-player possession spells...\n")
+    tracks, team_ball_control = make_tracks()
+    index = TrackIndex(tracks, team_ball_control, frame_rate=FRAME_RATE)
+
+    assert spells_as_list(index.get_player_possession_spells(17)) == [[3, 5], [7, 8], [15, 20]]
+    assert spells_as_list(index.get_player_possession_spells(4)) == [[5, 7], [9, 15]]
+
+    # Spells overlapping the range are clipped to it: frames 5-17
+    sliced = index.get_player_possession_spells(17, start_time=0.25, end_time=0.85)
+    assert spells_as_list(sliced) == [[7, 8], [15, 17]]
+    assert index.get_player_ball_frames(4, start_frame=12).tolist() == [12, 13, 14]
+    assert len(index.get_player_ball_frames(99)) == 0
+    print("  ✓ PASS\n")
+
+
+def test_team_possession_spells():
+    print("Testing team possession spells...\n")
+    tracks, team_ball_control = make_tracks()
+    index = TrackIndex(tracks, team_ball_control, frame_rate=FRAME_RATE)
+
+    # Frames without control are not a spell, and equal neighbours merge
+    assert spells_as_list(index.get_team_possession_spells(1)) == [[3, 5], [7, 9], [15, 20]]
+    assert spells_as_list(index.get_team_possession_spells(2)) == [[5, 7], [9, 15]]
+
+    spells = index.get_team_possession_spells(start_frame=4, end_frame=10)
+    assert spells_as_list(spells) == [[4, 5], [5, 7], [7, 9], [9, 10]]
+    assert spells['value'].tolist() == [1, 2, 1, 2]
+    print("  ✓ PASS\n")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("TrackIndex Test Suite")
+    print("="*60 + "\n")
+
+    try:
+        test_track_queries()
+        test_player_possession_spells()
+        test_team_possession_spells()
+    except AssertionError as e:
+        print(f"✗ FAIL: {e}")
+        sys.exit(1)
+
+    print("="*60)
+    print("✓ All tests PASSED!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that TrackStateStore stays bounded while track ids
+keep changing, and that recently expired ids resume their value
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'football_analysis-main'))
+from utils import TrackStateStore
+
+
+def state_size(store):
+    return len(store) + len(store.retired) + len(store.last_seen)
+
+
+def test_state_stays_flat():
+    print("Testing that state size stays flat with ever-new track ids...\n")
+    store = TrackStateStore(max_inactive_frames=10, max_entries=50, max_retired=100)
+
+    sizes = []
+    for frame_num in range(20000):
+        store.set_frame(frame_num)
+        # Ten new ids per frame, each seen for a single frame
+        for track_id in range(frame_num * 10, frame_num * 10 + 10):
+            store[track_id] = frame_num
+        if frame_num % 1000 == 999:
+            sizes.append(state_size(store))
+
+    print(f"  state size every 1000 frames: {sizes}")
+    assert len(store) <= 50
+    assert len(store.retired) <= 100
+    assert max(sizes) <= 2 * 50 + 100
+    assert sizes[-1] == sizes[0], "state grows with the number of ids seen"
+    assert store.spilled_count == 200000 - len(store)
+    print("  ✓ PASS\n")
+
+
+def test_returning_ids_resume():
+    print("Testing that recently expired ids resume their value...\n")
+    store = TrackStateStore(max_inactive_frames=2, max_retired=2)
+    store.set_frame(0)
+    for track_id in (1, 2, 3):
+        store[track_id] = track_id * 10
+    store.set_frame(5)
+
+    # Only the two most recently expired ids are kept
+    assert len(store) == 0
+    assert list(store.retired) == [2, 3]
+
+    # get() and [] resume the same way as `in`
+    assert store.get(3) == 30
+    assert store[2] == 20
+    assert 1 not in store
+    assert store.get(1, 'new') == 'new'
+    assert len(store) == 2 and len(store.retired) == 0
+    print("  ✓ PASS\n")
+
+
+def test_spill_keeps_final_total():
+    print("Testing that the last spill record per id is its final total...\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        spill_path = os.path.join(tmp, 'spill.jsonl')
+        store = TrackStateStore(max_inactive_frames=2, spill_path=spill_path, max_retired=10,
+                                summarize=lambda distance: {"total_distance": distance})
+        store.set_frame(0)
+        store[7] = 3.0
+        store.set_frame(5)
+        assert 7 in store
+        store[7] += 2.0
+        store.set_frame(10)
+        store.flush()
+
+        with open(spill_path) as f:
+            records = [json.loads(line) for line in f]
+
+    totals = [record["summary"]["total_distance"] for record in records if record["track_id"] == 7]
+    assert totals == [3.0, 5.0], totals
+    assert len(store) == 0 and len(store.retired) == 0
+    print("  ✓ PASS\n")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("TrackStateStore Test Suite")
+    print("="*60 + "\n")
+
+    try:
+        test_state_stays_flat()
+        test_returning_ids_resume()
+        test_spill_keeps_final_total()
+    except AssertionError as e:
+        print(f"✗ FAIL: {e}")
+        sys.exit(1)
+
+    print("="*60)
+    print("✓ All tests PASSED!")